@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+bench.py
+Microbenchmarks for the build pipeline.
+
+Usage:
+    python bench.py shuffle              # option shuffling, 10k questions
+    python bench.py shuffle --n 50000
+    python bench.py render               # page render, 100k questions
+    python bench.py count                # header counts, 50k-question cluster
+    python bench.py parse                # generate_quiz.parse_txt throughput
+    python bench.py suite                # whole pipeline at 1k/10k/100k → bench-results.json
+    python bench.py suite --sizes 1000 --compare bench-results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from copy import deepcopy
+from pathlib import Path
+
+import build
+import generate_quiz
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+def sample_bank(n: int) -> list[dict]:
+    """n questions drawn round-robin from the real banks (shared dicts)."""
+    pool = [q for qs in build.RAW_QUESTIONS.values() for q in qs]
+    return [pool[i % len(pool)] for i in range(n)]
+
+
+# ── Synthetic banks ───────────────────────────────────────────────────────────
+# Deterministic questions in the RAW_QUESTIONS shape, heavy on the things
+# that make real banks slow: long explanations and non-ASCII maths.
+_STEMS = (
+    'Evaluate ∫₀^{a} ({b}x² + {c}x) dx.',
+    'If sin θ = {a}/{d}, find cos θ for 0° ≤ θ ≤ 90°.',
+    'Solve x² − {b}x + {c} = 0 and give α + β, where α, β are the roots.',
+    'A wave has λ = {a}·10⁻² m and f = {d} Hz. Find v = fλ.',
+    'Simplify (√{a} + √{b})(√{a} − √{b}) ÷ {c}.',
+    'Find Σᵢ₌₁^{d} ({a}i + {b}) correct to 3 s.f.',
+)
+_STEPS = (
+    'Write down what is given: a = {a}, b = {b}, c = {c}, and note that Δ = b² − 4ac ≥ 0.',
+    'Substitute carefully, keeping every power (x², x³) and every root (√, ∛) exact until the last line.',
+    'Using π ≈ 3.142 and rounding only at the end gives ≈ {r}, which matches the option shown.',
+    'A common slip is to treat −{b}² as (−{b})²; the minus sign applies after squaring.',
+)
+
+
+def synthetic_questions(n: int, seed: int = 0) -> list[dict]:
+    """n distinct questions; the same n and seed always give the same bank."""
+    rng = random.Random(seed)
+    bank = []
+    for i in range(n):
+        v = {'a': rng.randint(2, 99), 'b': rng.randint(2, 99), 'c': rng.randint(2, 99),
+             'd': rng.randint(100, 999), 'r': f'{rng.random() * 100:.3f}'}
+        answer = 'ABCD'[rng.randrange(4)]
+        bank.append({
+            'text':        f'Q{i + 1}. ' + _STEMS[i % len(_STEMS)].format(**v),
+            'options':     {lbl: f'{v["a"] * k + i} × 10⁻{k} ≈ {k}π/{v["d"]}'
+                            for k, lbl in enumerate('ABCD', start=1)},
+            'answer':      answer,
+            'explanation': ' '.join(step.format(**v) for step in _STEPS * 2),
+            'exception':   f'If θ > 90° the sign of cos θ flips — check option {answer} again.',
+        })
+    return bank
+
+
+def write_txt_dump(path: Path, questions: list[dict], subject: str = 'Physics') -> int:
+    """Write questions as a JAMB .txt dump that parse_txt reads back; returns its line count."""
+    lines = [f'JAMB {subject} Past Questions', '']
+    for i, q in enumerate(questions, start=1):
+        lines.append(f'{i}. {q["text"]}')
+        lines.extend(f'{lbl}. {q["options"][lbl]}' for lbl in 'ABCD')
+        lines.append(f'Answer: {q["answer"]}')
+        lines.append(f'Explanation: {q["explanation"]}')
+        lines.append(f'Exception: {q["exception"]}')
+        lines.append('')
+    path.write_text('\n'.join(lines), encoding='utf-8')
+    return len(lines)
+
+
+def write_stub_page(path: Path) -> None:
+    """A minimal quiz page with an empty sentinel-delimited QUESTIONS block."""
+    start, end = generate_quiz.SENTINEL_START.decode(), generate_quiz.SENTINEL_END.decode()
+    path.write_text(f'<html><body><script>\n{start}\nconst QUESTIONS = [];\n{end}\n</script></body></html>\n',
+                    encoding='utf-8')
+
+
+def measure(fn, repeat: int = 3, setup=None) -> dict:
+    """
+    Best-of-N wall time, plus allocations of a single traced run.
+    setup, if given, runs untimed before every run of fn.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = fn()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    retained = sum(s.size_diff for s in stats)
+    blocks = sum(s.count_diff for s in stats)
+    del result
+    return {'seconds': best, 'peak_bytes': peak, 'retained_bytes': retained, 'blocks': blocks}
+
+
+def report(name: str, n: int, m: dict) -> None:
+    per10k = 10_000 / n
+    print(f'  {name:<22} {m["seconds"] * per10k * 1000:8.2f} ms/10k'
+          f'  {m["peak_bytes"] * per10k / 1024:9.1f} KiB peak/10k'
+          f'  {m["retained_bytes"] * per10k / 1024:9.1f} KiB kept/10k'
+          f'  {m["blocks"] * per10k:9.0f} blocks/10k')
+
+
+# ── Benchmarks ────────────────────────────────────────────────────────────────
+def deepcopy_shuffle(question, rng):
+    """The pre-ShuffledQuestion implementation, kept as the reference point."""
+    q = deepcopy(question)
+    labels = ['A', 'B', 'C', 'D']
+    pairs = [(lbl, q['options'][lbl]) for lbl in labels]
+    for i in range(len(pairs) - 1, 0, -1):
+        j = rng.randint(0, i)
+        pairs[i], pairs[j] = pairs[j], pairs[i]
+    q['options'] = {labels[k]: text for k, (_, text) in enumerate(pairs)}
+    q['answer'] = next((labels[k] for k, (lbl, _) in enumerate(pairs) if lbl == question['answer']), None)
+    return q
+
+
+def bench_shuffle(n: int) -> None:
+    bank = sample_bank(n)
+
+    def run(shuffle):
+        def go():
+            rng = random.Random(42)
+            return [shuffle(q, rng) for q in bank]
+        return go
+
+    print(f'\nOption shuffle over {n} questions:\n')
+    report('deepcopy (legacy)', n, measure(run(deepcopy_shuffle)))
+    report('ShuffledQuestion view', n, measure(run(build.fisher_yates_shuffle_options)))
+
+
+def bench_render(n: int) -> None:
+    qs = build.prepare_questions('Mock', sample_bank(n), random.Random(42))
+    args = ('Mock', 'Mock', 'index.html', 3600)
+
+    def in_memory(path):
+        html = build.build_quiz_html(*args, qs)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+
+    def streaming(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            build.write_quiz_html(f, *args, qs)
+
+    print(f'\nPage render + write of {n} questions:\n')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'page.html')
+        for name, fn in (('build_quiz_html', in_memory), ('write_quiz_html', streaming)):
+            m = measure(lambda: fn(path), repeat=1)
+            print(f'  {name:<22} {m["seconds"] * 1000:8.1f} ms'
+                  f'  {m["peak_bytes"] / 1024:10.1f} KiB peak'
+                  f'  ({os.path.getsize(path) / 2**20:.1f} MiB written)')
+
+
+def bench_count(n: int) -> None:
+    subjects = list(build.RAW_QUESTIONS)
+    rng = random.Random(42)
+    qs = []
+    for k, subj in enumerate(subjects):
+        share = n // len(subjects) + (k < n % len(subjects))
+        qs.extend(build.prepare_questions(subj, sample_bank(share), rng))
+    for q_id, q in enumerate(qs, start=1):
+        q.id = q_id
+    args = ('Cluster', 'Cluster', 'index.html', 3600)
+
+    def rescan():
+        # What build_quiz_html used to do: serialize, then regex its own output.
+        js = build.questions_to_js(qs)
+        total_q = len(re.findall(r'\bid:\s*\d+', js))
+        return (build.quiz_html_head('Cluster', 3600) + js
+                + build.quiz_html_tail('Cluster', 'index.html', 3600, total_q))
+
+    def structured():
+        return build.build_quiz_html(*args, qs)
+
+    js = build.questions_to_js(qs)
+    print(f'\nHeader counts for a {n}-question cluster:\n')
+    report_ms('regex count only', measure(lambda: len(re.findall(r'\bid:\s*\d+', js)))['seconds'])
+    report_ms('len(questions) only', measure(lambda: len(qs))['seconds'])
+    report_ms('page, regex rescan', measure(rescan)['seconds'])
+    report_ms('page, structured', measure(structured)['seconds'])
+
+
+def bench_parse(n: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'JAMB_Physics_bench.txt'
+        n_lines = write_txt_dump(path, synthetic_questions(n))
+        m = measure(lambda: generate_quiz.parse_txt(path))
+    print(f'\nparse_txt over {n} questions ({n_lines} lines):\n')
+    print(f'  {m["seconds"] * 1000:8.1f} ms   {n_lines / m["seconds"]:12,.0f} lines/s'
+          f'   {m["peak_bytes"] / 2**20:6.1f} MiB peak')
+
+
+def report_ms(name: str, seconds: float) -> None:
+    print(f'  {name:<22} {seconds * 1000:10.3f} ms')
+
+
+# ── Suite ─────────────────────────────────────────────────────────────────────
+SUITE_VERSION = 1
+SUITE_STAGES = ('parse_txt', 'prepare_questions', 'questions_to_js', 'build_quiz_html',
+                'inject_into_html', 'end_to_end')
+
+
+def suite_size(n: int, repeat: int, seed: int) -> dict:
+    """Time every pipeline stage over one synthetic n-question bank."""
+    bank = synthetic_questions(n, seed)
+    args = ('Physics', 'Physics', 'index.html', 3600)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        txt = Path(tmp) / 'JAMB_Physics_synthetic.txt'
+        page = Path(tmp) / 'quiz-physics.html'
+        write_txt_dump(txt, bank)
+        txt_bytes = txt.stat().st_size
+        write_stub_page(page)
+
+        parsed = generate_quiz.parse_txt(txt)
+        assert len(parsed) == n, f'parse_txt read {len(parsed)} of {n} questions'
+        prepared = build.prepare_questions('Physics', bank, random.Random(seed))
+
+        def end_to_end():
+            qs = generate_quiz.parse_txt(txt)
+            shuffled = build.prepare_questions('Physics', qs, random.Random(seed))
+            build.build_quiz_html(*args, shuffled)
+            generate_quiz.inject_into_html(page, qs, 900)
+
+        stages = {
+            'parse_txt':         lambda: generate_quiz.parse_txt(txt),
+            'prepare_questions': lambda: build.prepare_questions('Physics', bank, random.Random(seed)),
+            'questions_to_js':   lambda: build.questions_to_js(prepared),
+            'build_quiz_html':   lambda: build.build_quiz_html(*args, prepared),
+            'inject_into_html':  lambda: generate_quiz.inject_into_html(page, parsed, 900),
+            'end_to_end':        end_to_end,
+        }
+        # inject_into_html leaves a page that already holds the questions
+        # untouched, so these stages start every run from the empty stub.
+        reset = {'inject_into_html': lambda: write_stub_page(page), 'end_to_end': lambda: write_stub_page(page)}
+        for name in SUITE_STAGES:
+            m = measure(stages[name], repeat, reset.get(name))
+            m['us_per_question'] = m['seconds'] / n * 1e6
+            results[name] = m
+            print(f'  {n:>7}  {name:<18} {m["seconds"] * 1000:10.1f} ms'
+                  f'  {m["us_per_question"]:8.2f} µs/q  {m["peak_bytes"] / 2**20:8.1f} MiB peak')
+    return {'questions': n, 'txt_bytes': txt_bytes, 'stages': results}
+
+
+def compare(old: dict, new: dict) -> None:
+    """Print new/old time ratios for every size and stage both runs cover."""
+    print('\nAgainst the previous results (time ratio, < 1 is faster):\n')
+    for size, run in new['sizes'].items():
+        before = old.get('sizes', {}).get(size)
+        if not before:
+            continue
+        for name, m in run['stages'].items():
+            prev = before['stages'].get(name)
+            if prev and prev['seconds']:
+                ratio = m['seconds'] / prev['seconds']
+                flag = '  ⚠️' if ratio > 1.10 else ''
+                print(f'  {size:>7}  {name:<18} {ratio:6.2f}×{flag}')
+
+
+def bench_suite(sizes: list[int], repeat: int, seed: int, out: str, baseline: str | None) -> None:
+    old = json.loads(Path(baseline).read_text(encoding='utf-8')) if baseline else None
+    print(f'\nPipeline suite, sizes {", ".join(map(str, sizes))} (best of {repeat}):\n')
+    results = {
+        'version':  SUITE_VERSION,
+        'seed':     seed,
+        'repeat':   repeat,
+        'python':   platform.python_version(),
+        'platform': platform.platform(),
+        'sizes':    {str(n): suite_size(n, repeat, seed) for n in sizes},
+    }
+    Path(out).write_text(json.dumps(results, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+    print(f'\nResults written to {out}')
+    if old:
+        compare(old, results)
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description='Build pipeline microbenchmarks')
+    sub = parser.add_subparsers(dest='bench', required=True)
+    p = sub.add_parser('shuffle', help='fisher_yates_shuffle_options: time and allocations')
+    p.add_argument('--n', type=int, default=10_000)
+    p = sub.add_parser('render', help='build_quiz_html vs write_quiz_html: peak memory')
+    p.add_argument('--n', type=int, default=100_000)
+    p = sub.add_parser('count', help='regex-rescanned vs structured question counts')
+    p.add_argument('--n', type=int, default=50_000)
+    p = sub.add_parser('parse', help='generate_quiz.parse_txt: lines per second')
+    p.add_argument('--n', type=int, default=20_000)
+    p = sub.add_parser('suite', help='every pipeline stage on synthetic banks, saved as JSON')
+    p.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    p.add_argument('--repeat', type=int, default=3, help='best of N timed runs per stage')
+    p.add_argument('--seed', type=int, default=0, help='synthetic bank seed')
+    p.add_argument('--out', default='bench-results.json')
+    p.add_argument('--compare', metavar='JSON', help='earlier results to compare against')
+    args = parser.parse_args()
+
+    if args.bench == 'shuffle':
+        bench_shuffle(args.n)
+    elif args.bench == 'render':
+        bench_render(args.n)
+    elif args.bench == 'count':
+        bench_count(args.n)
+    elif args.bench == 'parse':
+        bench_parse(args.n)
+    elif args.bench == 'suite':
+        bench_suite(args.sizes, args.repeat, args.seed, args.out, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+dedup.py
+Content-addressed duplicate finder for question banks.
+
+Every question is normalized (text plus its option set, ignoring option
+order and whitespace) and hashed. Same hash → exact duplicate. Questions
+whose stems match once punctuation, case and Unicode forms are folded
+away, but whose hashes differ, are reported as near-duplicates.
+
+Usage:
+    python dedup.py                          # banks/*.jsonl + ./*.txt
+    python dedup.py physics.txt more.txt     # banks + these .txt files
+    python dedup.py --json dupes.json        # also write a machine-readable report
+    python dedup.py --pages                  # also every inline QUESTIONS array in the repo's pages
+"""
+
+import re
+import json
+import hashlib
+import argparse
+import unicodedata
+from pathlib import Path
+
+_WS_RE       = re.compile(r'\s+')
+_NON_WORD_RE = re.compile(r'[\W_]+')
+
+
+# ── Keys ──────────────────────────────────────────────────────────────────────
+def normalize(s) -> str:
+    """Canonical form for exact matching: NFC, single spaces, case-folded."""
+    return _WS_RE.sub(' ', unicodedata.normalize('NFC', str(s or ''))).strip().casefold()
+
+
+def question_key(q) -> str:
+    """Hash of the normalized text and the *set* of option texts."""
+    options = sorted(normalize(v) for v in q['options'].values())
+    blob = '\x1f'.join([normalize(q['text'])] + options)
+    return hashlib.blake2b(blob.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def loose_key(q) -> str:
+    """Stem only, compatibility-folded, with all punctuation and spacing removed."""
+    text = unicodedata.normalize('NFKC', str(q['text'] or '')).casefold()
+    return _NON_WORD_RE.sub('', text)
+
+
+def unique_questions(questions: list) -> list:
+    """Drop exact duplicates, keeping each question's first occurrence."""
+    seen = set()
+    result = []
+    for q in questions:
+        key = question_key(q)
+        if key not in seen:
+            seen.add(key)
+            result.append(q)
+    return result
+
+
+# ── Index ─────────────────────────────────────────────────────────────────────
+class DedupIndex:
+    """Question locations grouped by exact and loose key."""
+
+    def __init__(self):
+        self.exact: dict[str, list[str]] = {}
+        self.loose: dict[str, set[str]]  = {}
+        self.total = 0
+
+    def add(self, location: str, q) -> str:
+        key = question_key(q)
+        self.exact.setdefault(key, []).append(location)
+        self.loose.setdefault(loose_key(q), set()).add(key)
+        self.total += 1
+        return key
+
+    def add_source(self, source: str, questions) -> None:
+        """Index an iterable of question dicts; locations are source#position."""
+        for pos, q in enumerate(questions, start=1):
+            self.add(f'{source}#{pos}', q)
+
+    def duplicates(self) -> list[list[str]]:
+        return [locs for locs in self.exact.values() if len(locs) > 1]
+
+    def near_duplicates(self) -> list[list[list[str]]]:
+        """Groups of distinct exact keys sharing a stem, as their locations."""
+        return [[self.exact[k] for k in sorted(keys)]
+                for stem, keys in self.loose.items() if stem and len(keys) > 1]
+
+    def report(self) -> dict:
+        return {
+            'questions':       self.total,
+            'unique':          len(self.exact),
+            'duplicates':      self.duplicates(),
+            'near_duplicates': self.near_duplicates(),
+        }
+
+
+# ── Sources ───────────────────────────────────────────────────────────────────
+def index_sources(txt_files: list[Path], pages: list[Path] = ()) -> DedupIndex:
+    """
+    Index every subject bank that build.py reads, the given .txt dumps, and
+    the questions inline in the given HTML pages (located as page@byte).
+    """
+    import build
+    import generate_quiz
+    import extract_questions
+
+    index = DedupIndex()
+    for subject in build.RAW_QUESTIONS:
+        source = Path(build.RAW_QUESTIONS.path(subject)).relative_to(Path(build.BANK_DIR).parent)
+        index.add_source(source.as_posix(), build.RAW_QUESTIONS[subject])
+    for txt in txt_files:
+        index.add_source(txt.name, generate_quiz.parse_txt(txt))
+    if pages:
+        for q in extract_questions.iter_corpus(list(pages)):
+            src = q['source']
+            index.add(f'{src["page"]}@{(src["span"] or src["block"])[0]}', q)
+    return index
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description='Find duplicate questions across banks and .txt dumps.')
+    parser.add_argument('files', nargs='*', help='.txt files (default: every .txt in the current directory)')
+    parser.add_argument('--json', metavar='PATH', help='write the full report as JSON')
+    parser.add_argument('--pages', action='store_true',
+                        help='also index the QUESTIONS arrays inline in every .html page (see extract_questions.py)')
+    args = parser.parse_args()
+
+    txt_files = [Path(f) for f in args.files if f.endswith('.txt')] or sorted(Path('.').glob('*.txt'))
+    report = index_sources(txt_files, [Path('.')] if args.pages else []).report()
+
+    print(f'\n🔎 {report["questions"]} questions, {report["unique"]} unique\n')
+    for locs in report['duplicates']:
+        print(f'  ♻️  duplicate: {", ".join(locs)}')
+    for group in report['near_duplicates']:
+        print(f'  ≈  near-duplicate: {" | ".join(", ".join(locs) for locs in group)}')
+
+    if not (report['duplicates'] or report['near_duplicates']):
+        print('  No duplicates found.')
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        print(f'\nReport written to {args.json}')
+
+
+if __name__ == '__main__':
+    main()
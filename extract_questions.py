@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+extract_questions.py
+Harvests the inline `const QUESTIONS = [...]` arrays from existing HTML
+pages into a normalized JSON Lines corpus.
+
+Pages are read through a small sliding window, never whole, and the
+arrays are parsed as JavaScript *literals* — objects, arrays, strings,
+numbers, comments, trailing commas, 'a' + 'b' — without evaluating
+anything. A bare variable name (say `passage: PA`) is kept as
+{"$ref": "PA"}; a block that needs real code (a call, an operator) is
+reported and skipped. Pages built with --compact are decoded as well.
+
+Usage:
+    python extract_questions.py                       # every page in the repo → questions-corpus.jsonl
+    python extract_questions.py LKH-paper-1.html      # just these pages (or directories)
+    python extract_questions.py -o - | head           # corpus to stdout
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from generate_quiz import FILENAME_MAP
+
+CHUNK = 1 << 16
+LOOKAHEAD = 256
+SKIP_DIRS = {'output', 'node_modules', '__pycache__'}
+LABELS = 'ABCD'
+
+
+class JsLiteralError(ValueError):
+    """The text at offset is not a JavaScript literal this parser accepts."""
+
+    def __init__(self, message: str, offset: int):
+        super().__init__(f'{message} at byte {offset}')
+        self.offset = offset
+
+
+# ── Stream ────────────────────────────────────────────────────────────────────
+class ByteStream:
+    """Forward-only reader over a binary file, holding one window of it at a time."""
+
+    def __init__(self, f: BinaryIO, chunk: int = CHUNK):
+        self.f     = f
+        self.chunk = chunk
+        self.buf   = b''
+        self.base  = 0      # file offset of buf[0]
+        self.pos   = 0      # read position within buf
+        self.eof   = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self.f.read(self.chunk)
+        if not data:
+            self.eof = True
+            return False
+        if self.pos > self.chunk:
+            self.buf = self.buf[self.pos:]
+            self.base += self.pos
+            self.pos = 0
+        self.buf += data
+        return True
+
+    def tell(self) -> int:
+        return self.base + self.pos
+
+    def peek(self, n: int = 1) -> bytes:
+        while len(self.buf) - self.pos < n and self._fill():
+            pass
+        return self.buf[self.pos:self.pos + n]
+
+    def advance(self, n: int = 1) -> None:
+        self.peek(n)
+        self.pos = min(self.pos + n, len(self.buf))
+
+    def match(self, regex: re.Pattern, until_eof: bool = False) -> bytes | None:
+        """
+        Consume and return regex's match at the read position, or None.
+        A failed match is retried with more data only near the end of the
+        window, or all the way to EOF with until_eof (strings, comments).
+        """
+        while True:
+            m = regex.match(self.buf, self.pos)
+            if m and (m.end() < len(self.buf) or self.eof):
+                break
+            if m is None and not until_eof and len(self.buf) - self.pos >= LOOKAHEAD:
+                break
+            if not self._fill():
+                break
+        if m is None:
+            return None
+        self.pos = m.end()
+        return m.group()
+
+    def find(self, needle: bytes) -> int:
+        """Move to the next occurrence of needle; returns its offset, or -1 at EOF."""
+        while True:
+            i = self.buf.find(needle, self.pos)
+            if i != -1:
+                self.pos = i
+                return self.base + i
+            self.pos = max(self.pos, len(self.buf) - len(needle) + 1)
+            if not self._fill():
+                self.pos = len(self.buf)
+                return -1
+
+
+# ── Literal parser ────────────────────────────────────────────────────────────
+_SPACE_RE    = re.compile(rb'\s*')
+_LINE_RE     = re.compile(rb'//[^\n]*')
+_BLOCK_RE    = re.compile(rb'/\*.*?\*/', re.DOTALL)
+_IDENT_RE    = re.compile(rb'[A-Za-z_$][\w$]*')
+_NUMBER_RE   = re.compile(rb'[+-]?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)')
+_STRING_RE   = {
+    b"'": re.compile(rb"'(?:[^'\\\n]|\\.|\\\n)*'", re.DOTALL),
+    b'"': re.compile(rb'"(?:[^"\\\n]|\\.|\\\n)*"', re.DOTALL),
+    b'`': re.compile(rb'`(?:[^`\\]|\\.)*`', re.DOTALL),
+}
+_SKIP_RE     = re.compile(rb'[^()\[\]{}\'"`/]+|/(?![/*])')
+_ESCAPE_RE   = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|[0-7]{1,3}|\r\n|[\s\S])')
+_ESCAPES     = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v',
+                '\n': '', '\r': '', '\r\n': '', '\u2028': '', '\u2029': ''}
+_CONSTANTS   = {b'true': True, b'false': False, b'null': None, b'undefined': None}
+_CLOSERS     = {b'(': b')', b'[': b']', b'{': b'}'}
+
+
+def _unescape(m: re.Match) -> str:
+    e = m.group(1)
+    if e in _ESCAPES:
+        return _ESCAPES[e]
+    if e[0] == 'u':
+        return chr(int(e[1:].strip('{}'), 16))
+    if e[0] == 'x':
+        return chr(int(e[1:], 16))
+    if e[0] in '01234567':
+        return chr(int(e, 8))
+    return e
+
+
+class LiteralParser:
+    """Recursive-descent parser for JS literals read from a ByteStream."""
+
+    def __init__(self, stream: ByteStream):
+        self.s = stream
+
+    def error(self, message: str) -> JsLiteralError:
+        return JsLiteralError(message, self.s.tell())
+
+    def skip_ws(self) -> None:
+        while True:
+            self.s.match(_SPACE_RE)
+            two = self.s.peek(2)
+            if two == b'//':
+                self.s.match(_LINE_RE)
+            elif two == b'/*':
+                if self.s.match(_BLOCK_RE, until_eof=True) is None:
+                    raise self.error('unterminated comment')
+            else:
+                return
+
+    def expect(self, char: bytes) -> None:
+        self.skip_ws()
+        if self.s.peek() != char:
+            raise self.error(f'expected {char.decode()!r}, found {self.s.peek(12)!r}')
+        self.s.advance()
+
+    def value(self):
+        """One literal, including 'a' + 'b' string concatenation."""
+        result = self.primary()
+        self.skip_ws()
+        while isinstance(result, str) and self.s.peek() == b'+':
+            self.s.advance()
+            right = self.primary()
+            if not isinstance(right, str):
+                raise self.error('only strings can be concatenated')
+            result += right
+            self.skip_ws()
+        return result
+
+    def primary(self):
+        self.skip_ws()
+        c = self.s.peek()
+        if c == b'{':
+            return self.object()
+        if c == b'[':
+            return self.array()
+        if c in _STRING_RE:
+            return self.string()
+        if c and (c.isdigit() or c in b'+-.'):
+            return self.number()
+        word = self.s.match(_IDENT_RE)
+        if word in _CONSTANTS:
+            return _CONSTANTS[word]
+        if word is not None:
+            self.skip_ws()
+            if self.s.peek() not in (b',', b'}', b']'):
+                raise self.error(f'{word.decode()!r} starts an expression, not a literal')
+            return {'$ref': word.decode()}
+        raise self.error(f'unexpected {self.s.peek(12)!r}' if c else 'unexpected end of file')
+
+    def string(self) -> str:
+        quote = self.s.peek()
+        raw = self.s.match(_STRING_RE[quote], until_eof=True)
+        if raw is None:
+            raise self.error('unterminated string')
+        body = raw[1:-1].decode('utf-8')
+        if quote == b'`':
+            if '${' in body:
+                raise self.error('template literal with substitutions')
+            body = body.replace('\r\n', '\n')
+        text = _ESCAPE_RE.sub(_unescape, body) if '\\' in body else body
+        if any('\ud800' <= ch <= '\udfff' for ch in text):
+            text = text.encode('utf-16', 'surrogatepass').decode('utf-16')
+        return text
+
+    def number(self) -> int | float:
+        raw = self.s.match(_NUMBER_RE)
+        if raw is None:
+            raise self.error('bad number')
+        text = raw.decode()
+        if text.lstrip('+-')[:2].lower() == '0x':
+            return int(text, 16)
+        value = float(text)
+        return int(value) if value.is_integer() and re.fullmatch(r'[+-]?\d+', text) else value
+
+    def key(self) -> str:
+        c = self.s.peek()
+        if c in (b'"', b"'"):
+            return self.string()
+        if c and (c.isdigit() or c == b'.'):
+            return str(self.number())
+        word = self.s.match(_IDENT_RE)
+        if word is None:
+            raise self.error(f'bad property name {self.s.peek(12)!r}')
+        return word.decode()
+
+    def object(self) -> dict:
+        self.s.advance()
+        result = {}
+        while True:
+            self.skip_ws()
+            if self.s.peek() == b'}':
+                self.s.advance()
+                return result
+            key = self.key()
+            self.expect(b':')
+            result[key] = self.value()
+            self.skip_ws()
+            c = self.s.peek()
+            if c == b',':
+                self.s.advance()
+            elif c != b'}':
+                raise self.error(f'expected "," or "}}", found {self.s.peek(12)!r}')
+
+    def elements(self) -> Iterator[tuple[int, int, object]]:
+        """Yield (start, end, value) for each element of the array at the read position."""
+        self.s.advance()
+        while True:
+            self.skip_ws()
+            c = self.s.peek()
+            if c == b']':
+                self.s.advance()
+                return
+            if c == b',':               # hole
+                self.s.advance()
+                continue
+            start = self.s.tell()
+            item = self.value()
+            yield start, self.s.tell(), item
+            self.skip_ws()
+            c = self.s.peek()
+            if c == b',':
+                self.s.advance()
+            elif c != b']':
+                raise self.error(f'expected "," or "]", found {self.s.peek(12)!r}')
+
+    def array(self) -> list:
+        return [item for _, _, item in self.elements()]
+
+    def skip_group(self) -> None:
+        """Step over a balanced (...) of arbitrary code, minding strings and comments."""
+        stack = []
+        while True:
+            self.skip_ws()
+            c = self.s.peek()
+            if not c:
+                raise self.error('unbalanced brackets')
+            if c in _CLOSERS:
+                stack.append(_CLOSERS[c])
+                self.s.advance()
+            elif c in b')]}':
+                if not stack or stack.pop() != c:
+                    raise self.error('unbalanced brackets')
+                self.s.advance()
+                if not stack:
+                    return
+            elif c in _STRING_RE:
+                self.string()
+            elif self.s.match(_SKIP_RE) is None:
+                raise self.error(f'unexpected {self.s.peek(12)!r}')
+
+
+# ── Normalization ─────────────────────────────────────────────────────────────
+# Pages were written by hand over several years; these are the spellings
+# their question objects use for each field.
+ALIASES = {
+    'id':          ('id',),
+    'subject':     ('subject', 'subj'),
+    'topic':       ('topic',),
+    'text':        ('text', 'question'),
+    'options':     ('options', 'opts'),
+    'answer':      ('answer', 'ans', 'correct'),
+    'explanation': ('explanation', 'exp', 'explain'),
+    'exception':   ('exception',),
+}
+
+
+def decode_compact(d: dict) -> list[dict]:
+    """The question objects a --compact page's decoder would build from d."""
+    runs = iter(d.get('s', []))
+    subject, left = None, 0
+    questions = []
+    for i, text in enumerate(d.get('t', [])):
+        while not left:
+            subject, left = next(runs)
+        left -= 1
+        q = {'id': d['i'][i] if d.get('i') else i + 1, 'subject': subject, 'text': text,
+             'options': {lbl: d['o'][4 * i + j] for j, lbl in enumerate(LABELS)},
+             'answer': d['a'][i]}
+        if d.get('k') or d['e'][i]:
+            q['explanation'] = d['e'][i]
+        if d.get('k') or d['x'][i]:
+            q['exception'] = d['x'][i]
+        questions.append(q)
+    return questions
+
+
+SUBJECT_NAMES = {'math': 'Mathematics', 'maths': 'Mathematics', 'crs': 'CRS'}
+
+
+def page_subject(page: Path) -> str | None:
+    """Subject implied by a page's file name, if any (quiz-physics.html → Physics)."""
+    words = re.split(r'[_\-\s.]+', page.stem.lower())
+    for keyword in [*FILENAME_MAP, *SUBJECT_NAMES]:
+        if keyword in words:
+            return SUBJECT_NAMES.get(keyword, keyword.capitalize())
+    return None
+
+
+def _pick(obj: dict, field: str):
+    for name in ALIASES[field]:
+        if name in obj:
+            return name, obj[name]
+    return None, None
+
+
+def normalize(obj: dict, default_subject: str | None = None) -> dict:
+    """
+    Map one question object onto the bank schema. Options given as a
+    list become A-D; an answer given as an index becomes its letter.
+    Fields outside the schema are kept under "extra".
+    """
+    if not isinstance(obj, dict):
+        raise ValueError(f'question is a {type(obj).__name__}, not an object')
+    used = set()
+    found = {}
+    for field in ALIASES:
+        name, value = _pick(obj, field)
+        if name is not None:
+            used.add(name)
+            found[field] = value
+
+    options = found.get('options')
+    if isinstance(options, list):
+        options = dict(zip(LABELS, options))
+    if not isinstance(options, dict):
+        raise ValueError('question has no options')
+    answer = found.get('answer')
+    if isinstance(answer, int) and not isinstance(answer, bool) and 0 <= answer < len(LABELS):
+        answer = LABELS[answer]
+    if not isinstance(found.get('text'), str):
+        raise ValueError('question has no text')
+
+    record = {'id': found.get('id'), 'subject': found.get('subject', default_subject)}
+    if 'topic' in found:
+        record['topic'] = found['topic']
+    record.update(
+        text=found['text'],
+        options={str(k).upper(): '' if v is None else str(v) for k, v in options.items()},
+        answer=None if answer is None else str(answer).strip().upper(),
+        explanation='' if found.get('explanation') is None else str(found['explanation']),
+        exception='' if found.get('exception') is None else str(found['exception']),
+    )
+    extra = {k: v for k, v in obj.items() if k not in used}
+    if extra:
+        record['extra'] = extra
+    return record
+
+
+# ── Extraction ────────────────────────────────────────────────────────────────
+_ASSIGN_RE = re.compile(rb'const\s+QUESTIONS\s*=\s*')
+
+
+def iter_blocks(f: BinaryIO) -> Iterator[dict]:
+    """
+    Yield one dict per `const QUESTIONS = ...` in the file:
+      span      [start, end) of the whole declaration
+      items     [(start, end) or None, value] per question, in order
+      compact   whether it was a --compact (decoder) block
+      error     why the block could not be read, if it could not
+    """
+    stream = ByteStream(f)
+    parser = LiteralParser(stream)
+    while (start := stream.find(b'const QUESTIONS')) != -1:
+        if stream.match(_ASSIGN_RE) is None:
+            stream.advance()
+            continue
+        block = {'span': [start, None], 'items': [], 'compact': False, 'error': None}
+        try:
+            c = stream.peek()
+            if c == b'[':
+                block['items'] = [([s, e], v) for s, e, v in parser.elements()]
+            elif c == b'(':
+                parser.skip_group()
+                parser.expect(b'(')
+                data = parser.value()
+                parser.expect(b')')
+                block['compact'] = True
+                block['items'] = [(None, q) for q in decode_compact(data)]
+            else:
+                raise parser.error('QUESTIONS is not an array')
+            parser.skip_ws()
+            if stream.peek() == b';':
+                stream.advance()
+        except (JsLiteralError, KeyError, IndexError, TypeError, StopIteration, UnicodeDecodeError) as e:
+            block['error'] = str(e) or type(e).__name__
+            block['items'] = []
+        block['span'][1] = stream.tell()
+        yield block
+
+
+def extract_page(path: Path, root: Path) -> Iterator[dict]:
+    """Corpus records for every readable question on one page; problems go to stderr."""
+    page = path.relative_to(root).as_posix() if path.is_relative_to(root) else path.as_posix()
+    subject = page_subject(path)
+    with open(path, 'rb') as f:
+        for b, block in enumerate(iter_blocks(f)):
+            if block['error']:
+                print(f'  ⚠️  {page}: block {b} at byte {block["span"][0]} skipped — {block["error"]}',
+                      file=sys.stderr)
+                continue
+            for i, (span, obj) in enumerate(block['items']):
+                try:
+                    record = normalize(obj, subject)
+                except ValueError as e:
+                    where = span[0] if span else block['span'][0]
+                    print(f'  ⚠️  {page}: question {i + 1} at byte {where} skipped — {e}', file=sys.stderr)
+                    continue
+                record['source'] = {'page': page, 'block': block['span'], 'index': i, 'span': span}
+                yield record
+
+
+def find_pages(paths: list[Path]) -> list[Path]:
+    """Every .html file under the given files and directories, skipping build output."""
+    pages = []
+    for path in paths:
+        if path.is_file():
+            pages.append(path)
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d not in SKIP_DIRS)
+            pages.extend(Path(dirpath) / n for n in sorted(filenames) if n.endswith('.html'))
+    return pages
+
+
+def iter_corpus(paths: list[Path], root: Path = Path('.')) -> Iterator[dict]:
+    for page in find_pages(paths):
+        yield from extract_page(page, root)
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description='Extract inline QUESTIONS arrays from HTML pages into JSON Lines.')
+    parser.add_argument('paths', nargs='*', help='pages or directories (default: the whole repo)')
+    parser.add_argument('-o', '--out', default='questions-corpus.jsonl', help="output file, or '-' for stdout")
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.paths] or [Path('.')]
+    out = sys.stdout if args.out == '-' else open(args.out, 'w', encoding='utf-8')
+    pages = set()
+    total = 0
+    try:
+        for record in iter_corpus(paths):
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            pages.add(record['source']['page'])
+            total += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f'\n📦 {total} questions from {len(pages)} pages'
+          + ('' if out is sys.stdout else f' → {args.out}'), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,14 +7,29 @@ directly into the corresponding quiz HTML pages.
 Usage:
     python generate_quiz.py                  # process all .txt files
     python generate_quiz.py physics.txt      # process one file
+    python generate_quiz.py -j 0             # parse in one process per CPU
+    python generate_quiz.py --index          # (re)index every page's QUESTIONS block
+    python generate_quiz.py --profile p.json # per-stage timings (see instrument.py)
+    python generate_quiz.py --watch          # re-inject pages as their .txt files change
 """
 
 import os
 import re
 import sys
 import json
+import time
+import argparse
+import concurrent.futures
 from pathlib import Path
 
+import instrument
+from build import iter_compact_js
+from dedup import unique_questions
+from instrument import stage
+from output_writer import WRITER
+from validate import Issue, print_issues, validate_questions
+from watch import Poller, watch
+
 # ── File name mapping ─────────────────────────────────────────────────────────
 # Maps keywords found in .txt filenames → quiz HTML filenames
 FILENAME_MAP = {
@@ -32,77 +47,100 @@ FILENAME_MAP = {
     'crs':         'quiz-crs.html',
 }
 
+# Every page these files feed is an individual subject: 15 minutes.
+DURATION = 900
+
 # ── Parser ────────────────────────────────────────────────────────────────────
-def parse_txt(path: Path) -> list[dict]:
-    """Parse a JAMB question .txt file into a list of question dicts."""
+# One precompiled pattern classifies every line in a single match;
+# m.lastgroup names the branch that hit.
+_LINE_RE = re.compile(
+    r'(?P<num>\d+)\.\s+(?P<question>.+)'
+    r'|(?P<label>[A-D])\.\s+(?P<option>.+)'
+    r'|(?P<field>Answer|Explanation|Exception):'
+    r'|(?P<header>JAMB\s)'
+)
+
+
+def iter_lines(path: Path):
+    """Stream stripped lines, splitting exactly where str.splitlines() would."""
+    with path.open(encoding='utf-8') as f:
+        for raw in f:
+            for line in raw.splitlines():
+                yield line.strip()
+
+
+def parse_txt(path: Path, locations: list[int] | None = None) -> list[dict]:
+    """
+    Parse a JAMB question .txt file into a list of question dicts.
+    If given, locations receives the line number each question starts on.
+    """
     questions = []
+    subject   = subject_from_path(path)
     current   = None
-    collecting_explanation = False
-    collecting_exception   = False
-
-    for raw in path.read_text(encoding='utf-8').splitlines():
-        line = raw.strip()
+    explanation = exception = None  # text pieces, joined with ' ' at the end
+    collecting  = None              # whichever of the two continuation lines extend
+
+    def finish():
+        if explanation:
+            current['explanation'] = ' '.join(explanation)
+        if exception:
+            current['exception'] = ' '.join(exception)
+        questions.append(current)
 
+    for lineno, line in enumerate(iter_lines(path), start=1):
         # Skip blank lines and file header
-        if not line or re.match(r'^JAMB\s', line) or 'EXCEPTIONAL QUESTIONS' in line:
+        if not line or 'EXCEPTIONAL QUESTIONS' in line:
+            continue
+        m    = _LINE_RE.match(line)
+        kind = m.lastgroup if m else None
+        if kind == 'header':
             continue
 
         # New question: "1. Question text"
-        m = re.match(r'^(\d+)\.\s+(.+)$', line)
-        if m:
+        if kind == 'question':
             if current:
-                questions.append(current)
+                finish()
+            if locations is not None:
+                locations.append(lineno)
             current = {
-                'id':          int(m.group(1)),
-                'subject':     subject_from_path(path),
-                'text':        m.group(2),
+                'id':          int(m.group('num')),
+                'subject':     subject,
+                'text':        m.group('question'),
                 'options':     {},
                 'answer':      None,
                 'explanation': '',
                 'exception':   '',
             }
-            collecting_explanation = False
-            collecting_exception   = False
+            explanation = exception = collecting = None
             continue
 
         if current is None:
             continue
 
         # Option: "A. text"
-        m = re.match(r'^([A-D])\.\s+(.+)$', line)
-        if m:
-            current['options'][m.group(1)] = m.group(2)
-            collecting_explanation = collecting_exception = False
-            continue
-
-        # Answer
-        if line.startswith('Answer:'):
-            current['answer'] = line.replace('Answer:', '').strip()
-            collecting_explanation = collecting_exception = False
-            continue
-
-        # Explanation
-        if line.startswith('Explanation:'):
-            current['explanation'] = line.replace('Explanation:', '').strip()
-            collecting_explanation = True
-            collecting_exception   = False
+        if kind == 'option':
+            current['options'][m.group('label')] = m.group('option')
+            collecting = None
             continue
 
-        # Exception
-        if line.startswith('Exception:'):
-            current['exception'] = line.replace('Exception:', '').strip()
-            collecting_explanation = False
-            collecting_exception   = True
+        if kind == 'field':
+            field = m.group('field')
+            value = line.replace(field + ':', '').strip()
+            if field == 'Answer':
+                current['answer'] = value
+                collecting = None
+            elif field == 'Explanation':
+                collecting = explanation = [value]
+            else:
+                collecting = exception = [value]
             continue
 
         # Continuation lines
-        if collecting_explanation:
-            current['explanation'] += ' ' + line
-        elif collecting_exception:
-            current['exception'] += ' ' + line
+        if collecting is not None:
+            collecting.append(line)
 
     if current:
-        questions.append(current)
+        finish()
 
     return questions
 
@@ -119,15 +157,32 @@ def subject_from_path(path: Path) -> str:
 
 
 # ── Injector ──────────────────────────────────────────────────────────────────
-def questions_to_js(questions: list[dict]) -> str:
-    """Render the QUESTIONS JS array as a formatted string."""
+def _clean(s: str) -> str:
+    return s.replace('`', "'").replace('\\', '\\\\')
+
+
+def questions_to_js(questions: list[dict], compact: bool = False) -> str:
+    """
+    Render the QUESTIONS JS array as a formatted string, or with compact
+    as columnar arrays plus a decoder (see build.iter_compact_js) that
+    rebuilds exactly the same objects.
+    """
+    if compact:
+        records = [
+            (q['id'], q['subject'], _clean(q['text']),
+             [q.get('options', {}).get(lbl, '') for lbl in 'ABCD'], q.get('answer', ''),
+             _clean(q.get('explanation', '')), _clean(q.get('exception', '')))
+            for q in questions
+        ]
+        return ''.join(iter_compact_js(records, keep_empty=True))
+
     lines = ['const QUESTIONS = [']
     for i, q in enumerate(questions):
         comma = '' if i == len(questions) - 1 else ','
         opts  = q.get('options', {})
-        explanation = q.get('explanation', '').replace('`', "'").replace('\\', '\\\\')
-        exception   = q.get('exception',   '').replace('`', "'").replace('\\', '\\\\')
-        text        = q['text'].replace('`', "'").replace('\\', '\\\\')
+        explanation = _clean(q.get('explanation', ''))
+        exception   = _clean(q.get('exception',   ''))
+        text        = _clean(q['text'])
         lines.append(f'  {{')
         lines.append(f'    id: {q["id"]}, subject: {json.dumps(q["subject"])},')
         lines.append(f'    text: {json.dumps(text)},')
@@ -145,7 +200,216 @@ def questions_to_js(questions: list[dict]) -> str:
     return '\n'.join(lines)
 
 
-def inject_into_html(html_path: Path, questions: list[dict], duration: int) -> bool:
+# ── Page index ────────────────────────────────────────────────────────────────
+# Byte offsets of every page's QUESTIONS block live in a sidecar file, so a
+# refresh splices new data in at known offsets instead of regex-searching
+# each document. A page is rescanned only when its size or mtime changes.
+INDEX_FILE      = '.questions-index.json'
+INDEX_VERSION   = 2
+SENTINEL_START  = b'<!-- QUESTIONS_START -->'
+SENTINEL_END    = b'<!-- QUESTIONS_END -->'
+
+_ASSIGN_RE   = re.compile(rb'const\s+QUESTIONS\s*=\s*[\[(]')
+_DURATION_RE = re.compile(rb'const\s+DURATION\s*=\s*\d+\s*;')
+_TOKEN_RE    = re.compile(rb'[\[\]()\'"`]|//|/\*')
+_STRING_TAIL = {
+    b"'": re.compile(rb"(?:[^'\\]|\\.)*'", re.DOTALL),
+    b'"': re.compile(rb'(?:[^"\\]|\\.)*"', re.DOTALL),
+    b'`': re.compile(rb'(?:[^`\\]|\\.)*`', re.DOTALL),
+}
+
+
+def _match_bracket(data: bytes, pos: int) -> int | None:
+    """
+    Offset just past the bracket closing the '[' or '(' before pos,
+    skipping strings and comments.
+    """
+    depth = 1
+    while depth:
+        m = _TOKEN_RE.search(data, pos)
+        if m is None:
+            return None
+        tok, pos = m.group(), m.end()
+        if tok in (b'[', b'('):
+            depth += 1
+        elif tok in (b']', b')'):
+            depth -= 1
+        elif tok == b'//':
+            nl = data.find(b'\n', pos)
+            pos = len(data) if nl == -1 else nl
+        elif tok == b'/*':
+            close = data.find(b'*/', pos)
+            if close == -1:
+                return None
+            pos = close + 2
+        else:
+            s = _STRING_TAIL[tok].match(data, pos)
+            if s is None:
+                return None
+            pos = s.end()
+    return pos
+
+
+def scan_page(data: bytes) -> dict:
+    """
+    Locate the injection points in a page:
+      blocks   — [start, end) of every `const QUESTIONS = [...];`, or of
+                 the compact `const QUESTIONS=(decoder)({...});`
+      duration — the last `const DURATION = N;` before the first block
+      sentinel — the text between QUESTIONS_START and QUESTIONS_END
+    """
+    blocks = []
+    pos = 0
+    while (hit := data.find(b'const QUESTIONS', pos)) != -1:
+        m = _ASSIGN_RE.match(data, hit)
+        if m is None:
+            pos = hit + 1
+            continue
+        end = _match_bracket(data, m.end())
+        while end is not None and data[end:end + 1] == b'(':   # decoder call
+            end = _match_bracket(data, end + 1)
+        if end is None:
+            break
+        if data[end:end + 1] == b';':
+            end += 1
+        blocks.append([hit, end])
+        pos = end
+
+    duration = None
+    if blocks:
+        hit = data.rfind(b'const DURATION', 0, blocks[0][0])
+        m = _DURATION_RE.match(data, hit) if hit != -1 else None
+        if m:
+            duration = [m.start(), m.end()]
+
+    sentinel = None
+    start = data.find(SENTINEL_START)
+    if start != -1:
+        end = data.find(SENTINEL_END, start)
+        if end != -1:
+            sentinel = [start + len(SENTINEL_START), end]
+
+    return {'blocks': blocks, 'duration': duration, 'sentinel': sentinel}
+
+
+def spans_match(data: bytes, entry: dict) -> bool:
+    """
+    True if every span in entry still sits on what scan_page found there.
+    Size and mtime can survive an edit (rsync -t, cp -p, tar), so offsets
+    are checked against the bytes before anything is spliced at them.
+    """
+    sentinel = entry['sentinel']
+    if sentinel and not (data[:sentinel[0]].endswith(SENTINEL_START)
+                         and data.startswith(SENTINEL_END, sentinel[1])):
+        return False
+    duration = entry['duration']
+    if duration:
+        m = _DURATION_RE.match(data, duration[0])
+        if m is None or m.end() != duration[1]:
+            return False
+    return all(data.startswith(b'const QUESTIONS', start) and data[end - 1:end] in (b']', b')', b';')
+               for start, end in entry['blocks'])
+
+
+class PageIndex:
+    """Sidecar index of QUESTIONS offsets for every page under root."""
+
+    def __init__(self, root: Path, persist: bool = True):
+        self.root    = root
+        self.path    = root / INDEX_FILE
+        self.persist = persist
+        self.pages: dict[str, dict] = {}
+        if persist:
+            try:
+                saved = json.loads(self.path.read_text(encoding='utf-8'))
+                if saved.get('version') == INDEX_VERSION:
+                    self.pages = saved['pages']
+            except (OSError, ValueError, KeyError):
+                pass
+
+    def _key(self, page: Path) -> str:
+        return os.path.relpath(page, self.root).replace(os.sep, '/')
+
+    def entry(self, page: Path) -> dict:
+        """The page's offsets, rescanning only if it changed since indexing."""
+        st = page.stat()
+        key = self._key(page)
+        cached = self.pages.get(key)
+        if cached and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns:
+            return cached
+        with stage('index'):
+            entry = scan_page(page.read_bytes())
+        entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+        self.pages[key] = entry
+        return entry
+
+    def refresh(self, pages) -> list[Path]:
+        """Bring the index up to date; returns the pages that had to be rescanned."""
+        rescanned = []
+        for page in pages:
+            cached = self.pages.get(self._key(page))
+            if self.entry(page) is not cached:
+                rescanned.append(page)
+        return rescanned
+
+    def splice(self, page: Path, span: list[int], new: bytes) -> bool:
+        """
+        Replace bytes [start, end) of page with new, then fix up the offsets.
+        The page is rewritten atomically, and not at all if nothing changed.
+        Returns False, having rescanned the page, if the cached offsets no
+        longer match its bytes; the caller then works out span again.
+        """
+        start, end = span
+        entry = self.entry(page)
+        data = page.read_bytes()
+        if not spans_match(data, entry):
+            with stage('index'):
+                fresh = scan_page(data)
+            st = page.stat()
+            fresh.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+            self.pages[self._key(page)] = fresh
+            return False
+        if data[start:end] == new:
+            return True
+        with stage('write'):
+            WRITER.write_bytes(str(page), b''.join((data[:start], new, data[end:])))
+
+        # Spans clear of the edit just shift; the ones it touched are
+        # rediscovered by scanning the (small) replacement itself.
+        delta = len(new) - (end - start)
+
+        def moved(s):
+            if s is None or start < s[1] and s[0] < end:
+                return None
+            return s if s[1] <= start else [s[0] + delta, s[1] + delta]
+
+        found = scan_page(new)
+        entry['blocks'] = sorted(
+            [s for s in map(moved, entry['blocks']) if s]
+            + [[s + start, e + start] for s, e in found['blocks']]
+        )
+        entry['duration'] = moved(entry['duration']) or (
+            found['duration'] and [found['duration'][0] + start, found['duration'][1] + start])
+        sentinel = entry['sentinel']
+        if sentinel and sentinel[0] <= start and end <= sentinel[1]:
+            entry['sentinel'] = [sentinel[0], sentinel[1] + delta]
+        else:
+            entry['sentinel'] = moved(sentinel)
+
+        st = page.stat()
+        entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+        return True
+
+    def save(self) -> None:
+        if self.persist:
+            payload = {'version': INDEX_VERSION, 'pages': self.pages}
+            data = (json.dumps(payload, indent=1, sort_keys=True) + '\n').encode('utf-8')
+            with stage('index'):
+                WRITER.write_bytes(str(self.path), data)
+
+
+def inject_into_html(html_path: Path, questions: list[dict], duration: int,
+                     index: PageIndex | None = None, compact: bool = False) -> bool:
     """
     Replace the QUESTIONS block between the two sentinel comments in the HTML.
     The block looks like:
@@ -153,31 +417,35 @@ def inject_into_html(html_path: Path, questions: list[dict], duration: int) -> b
         const DURATION  = ...;
         const QUESTIONS = [...];
         <!-- QUESTIONS_END -->
+    Pages without sentinels get their first `const QUESTIONS = [...];`
+    replaced, together with the `const DURATION = N;` before it if any.
+    Offsets come from index (a throwaway one if none is given).
+    compact selects the columnar QUESTIONS format.
     """
-    html = html_path.read_text(encoding='utf-8')
-
-    new_block = (
-        f'const DURATION  = {duration}; // seconds\n\n'
-        + questions_to_js(questions)
-    )
-
-    # Try sentinel comment replacement first (most reliable)
-    pattern = r'(<!-- QUESTIONS_START -->).*?(<!-- QUESTIONS_END -->)'
-    replacement = r'\g<1>\n' + new_block + r'\n\2'
-    new_html, count = re.subn(pattern, replacement, html, flags=re.DOTALL)
-
-    if count == 0:
-        # Fallback: replace between const DURATION and closing ];
-        pattern2 = r'(const DURATION\s*=\s*\d+;.*?const QUESTIONS\s*=\s*\[).*?(\];)'
-        replacement2 = new_block
-        new_html, count = re.subn(pattern2, replacement2, html, flags=re.DOTALL)
-
-    if count == 0:
-        print(f'  ⚠️  Could not find injection point in {html_path.name} — skipping')
-        return False
-
-    html_path.write_text(new_html, encoding='utf-8')
-    return True
+    index = index or PageIndex(html_path.parent, persist=False)
+
+    with stage('serialize'):
+        questions_js = questions_to_js(questions, compact)
+    new_block = f'const DURATION  = {duration}; // seconds\n\n' + questions_js
+
+    # splice() refuses stale offsets and rescans, so go round again with the fresh ones.
+    while True:
+        entry = index.entry(html_path)
+        if entry['sentinel']:
+            # Try sentinel comment replacement first (most reliable)
+            span, new = entry['sentinel'], f'\n{new_block}\n'
+        elif not entry['blocks']:
+            print(f'  ⚠️  Could not find injection point in {html_path.name} — skipping')
+            return False
+        else:
+            # Fallback: the first QUESTIONS array, from its DURATION if it has one
+            start, end = entry['blocks'][0]
+            if entry['duration']:
+                span, new = [entry['duration'][0], end], new_block
+            else:
+                span, new = [start, end], questions_js
+        if index.splice(html_path, span, new.encode('utf-8')):
+            return True
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
@@ -190,36 +458,155 @@ def resolve_html(txt_path: Path) -> Path | None:
     return None
 
 
-def process_file(txt_path: Path) -> bool:
-    html_path = resolve_html(txt_path)
-    if html_path is None:
-        print(f'  ⚠️  No HTML mapping for {txt_path.name} — skipping')
-        return False
-
-    if not html_path.exists():
-        print(f'  ⚠️  {html_path} does not exist — skipping')
-        return False
-
-    questions = parse_txt(txt_path)
-    if not questions:
-        print(f'  ⚠️  No questions parsed from {txt_path.name} — skipping')
-        return False
+def parse_job(txt_path: Path) -> tuple[Path, list[dict], list[Issue], float]:
+    """Parse and validate one file, and time it. Runs in a worker process in batch mode."""
+    start = time.perf_counter()
+    lines = []
+    with stage('parse'):
+        questions = parse_txt(txt_path, lines)
+    with stage('validate'):
+        issues = validate_questions(questions, txt_path.name, lines)
+    return txt_path, questions, issues, time.perf_counter() - start
 
-    # Duration: 15 min for individual subjects
-    duration = 900
 
-    ok = inject_into_html(html_path, questions, duration)
+def merge_sources(parsed: list[tuple[Path, list[dict]]],
+                  dedup: bool = False) -> tuple[list[dict], list[str]]:
+    """
+    Concatenate the questions of every .txt file that maps to one HTML page,
+    in file order. Returns the merged list and any conflicts worth reporting.
+    With dedup, repeated questions (see dedup.question_key) are kept once.
+    """
+    merged = [q for _, questions in parsed for q in questions]
+    conflicts = []
+    if len(parsed) > 1:
+        names = ', '.join(p.name for p, _ in parsed)
+        conflicts.append(f'{len(parsed)} sources merged: {names}')
+    if dedup:
+        unique = unique_questions(merged)
+        if len(unique) < len(merged):
+            conflicts.append(f'{len(merged) - len(unique)} duplicate question(s) dropped')
+        merged = unique
+    ids = [q['id'] for q in merged]
+    if len(set(ids)) != len(ids):
+        conflicts.append(f'duplicate question ids — renumbered 1..{len(merged)}')
+        merged = [dict(q, id=i) for i, q in enumerate(merged, start=1)]
+    return merged, conflicts
+
+
+def inject_page(html_path: Path, sources: list[tuple[Path, list[dict]]], index: PageIndex,
+                dedup: bool = False, compact: bool = False) -> tuple[bool, list[str]]:
+    """Merge one page's sources and inject them. Returns (injected, conflicts)."""
+    with stage('merge'):
+        questions, conflicts = merge_sources(sources, dedup=dedup)
+    with stage('inject'):
+        ok = inject_into_html(html_path, questions, DURATION, index, compact=compact)
     if ok:
-        print(f'  ✅  {txt_path.name} → {html_path.name} ({len(questions)} questions)')
-    return ok
+        names = ' + '.join(p.name for p, _ in sources)
+        print(f'  ✅  {names} → {html_path.name} ({len(questions)} questions)')
+    return ok, conflicts
 
 
 def main():
-    txt_files = []
-
-    if len(sys.argv) > 1:
+    parser = argparse.ArgumentParser(description='Inject JAMB .txt questions into the quiz HTML pages.')
+    parser.add_argument('files', nargs='*', help='.txt files (default: every .txt in the current directory)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='parse in N worker processes (0 = one per CPU)')
+    parser.add_argument('--dedup', action='store_true',
+                        help='inject each distinct question once per page')
+    parser.add_argument('--compact', action='store_true',
+                        help='write QUESTIONS as columnar arrays plus a small decoder')
+    parser.add_argument('--index', action='store_true',
+                        help=f'refresh {INDEX_FILE} for every .html page and exit')
+    parser.add_argument('--profile', metavar='REPORT',
+                        help='time each stage (parse, serialize, inject, ...) and write a JSON report')
+    parser.add_argument('--cprofile', metavar='PATH', help='also dump cProfile stats to PATH')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and re-inject the pages whose .txt files change')
+    parser.add_argument('--interval', type=float, default=0.3, metavar='SECONDS',
+                        help='how often --watch polls for changes (default 0.3)')
+    args = parser.parse_args()
+
+    if args.watch:
+        watch_txt(args)
+        return
+    with instrument.session(args.profile, args.cprofile):
+        run(args)
+
+
+def watch_txt(args: argparse.Namespace) -> None:
+    """
+    Inject every page once, then re-parse only the .txt files that change
+    and re-inject only the pages they map to. Parsed questions and the
+    page index stay in memory between rounds.
+    """
+    explicit = [Path(f) for f in args.files if f.endswith('.txt')]
+    poller   = Poller(lambda: explicit or sorted(Path('.').glob('*.txt')))
+    index    = PageIndex(Path('.'))
+    parsed: dict[Path, list[dict]] = {}
+
+    def update(changes: dict[Path, str | None]) -> None:
+        pages = set()
+        blocked = set()
+        for txt_path, digest in changes.items():
+            html_path = resolve_html(txt_path)
+            if html_path is None:
+                print(f'  ⚠️  No HTML mapping for {txt_path.name} — skipping')
+                continue
+            if digest is None:
+                parsed.pop(txt_path, None)
+                print(f'  🗑️  {txt_path.name} removed')
+            else:
+                _, questions, issues, _ = parse_job(txt_path)
+                if issues:
+                    # The page keeps the last valid version until the file is fixed.
+                    print_issues(issues)
+                    print(f'  ⚠️  {len(issues)} problem(s) in {txt_path.name} — {html_path.name} left as is')
+                    blocked.add(html_path)
+                    continue
+                parsed[txt_path] = questions
+            pages.add(html_path)
+
+        for html_path in sorted(pages - blocked):
+            if not html_path.exists():
+                print(f'  ⚠️  {html_path} does not exist — skipping')
+                continue
+            sources = [(p, qs) for p, qs in sorted(parsed.items()) if qs and resolve_html(p) == html_path]
+            if not sources:
+                print(f'  ⚠️  No questions left for {html_path.name} — page left as is')
+                continue
+            _, conflicts = inject_page(html_path, sources, index, args.dedup, args.compact)
+            for c in conflicts:
+                print(f'    ⚠️  {html_path.name}: {c}')
+        index.save()
+        WRITER.commit()
+
+    def on_change(changes: dict[Path, str | None]) -> None:
+        start = time.perf_counter()
+        with instrument.session(args.profile, args.cprofile):
+            update(changes)
+        print(f'👀 Watching .txt files ({(time.perf_counter() - start) * 1000:.0f} ms) — Ctrl+C to stop')
+
+    watch(poller, on_change, args.interval)
+
+
+def run(args: argparse.Namespace) -> None:
+    with stage('index'):
+        index = PageIndex(Path('.'))
+    if args.index:
+        pages = sorted(Path('.').glob('*.html'))
+        start = time.perf_counter()
+        rescanned = index.refresh(pages)
+        index.save()
+        WRITER.commit()
+        n_blocks = sum(len(index.entry(p)['blocks']) for p in pages)
+        n_pages = sum(1 for p in pages if index.entry(p)['blocks'])
+        print(f'Indexed {n_blocks} QUESTIONS blocks in {n_pages}/{len(pages)} pages '
+              f'({len(rescanned)} rescanned, {(time.perf_counter() - start) * 1000:.0f} ms)')
+        return
+
+    if args.files:
         # Specific files passed as arguments
-        txt_files = [Path(f) for f in sys.argv[1:] if f.endswith('.txt')]
+        txt_files = [Path(f) for f in args.files if f.endswith('.txt')]
     else:
         # All .txt files in current directory
         txt_files = sorted(Path('.').glob('*.txt'))
@@ -229,10 +616,58 @@ def main():
         sys.exit(0)
 
     print(f'\n📚 Processing {len(txt_files)} file(s)...\n')
-    success = 0
+
+    targets = {}
     for f in txt_files:
-        if process_file(f):
-            success += 1
+        html_path = resolve_html(f)
+        if html_path is None:
+            print(f'  ⚠️  No HTML mapping for {f.name} — skipping')
+        elif not html_path.exists():
+            print(f'  ⚠️  {html_path} does not exist — skipping')
+        else:
+            targets[f] = html_path
+
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs > 1 and instrument.enabled():
+        print('  ℹ️  Profiling parses in one process (-j ignored)')
+        jobs = 1
+    if jobs > 1 and len(targets) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(targets))) as pool:
+            results = list(pool.map(parse_job, targets))
+    else:
+        results = [parse_job(f) for f in targets]
+
+    # Group by target page so each HTML file is read, injected and written once.
+    issues = [issue for _, _, found, _ in results for issue in found]
+    if issues:
+        print_issues(issues)
+        print(f'\n❌  {len(issues)} problem(s) in the .txt files — no pages were touched.')
+        sys.exit(1)
+
+    groups: dict[Path, list[tuple[Path, list[dict]]]] = {}
+    for txt_path, questions, _, seconds in results:
+        if not questions:
+            print(f'  ⚠️  No questions parsed from {txt_path.name} — skipping')
+            continue
+        print(f'  📄  {txt_path.name}: {len(questions)} questions in {seconds * 1000:.1f} ms')
+        groups.setdefault(targets[txt_path], []).append((txt_path, questions))
+
+    print()
+    success = 0
+    all_conflicts = []
+    for html_path, parsed in groups.items():
+        ok, conflicts = inject_page(html_path, parsed, index, args.dedup, args.compact)
+        all_conflicts.extend(f'{html_path.name}: {c}' for c in conflicts)
+        if ok:
+            success += len(parsed)
+
+    index.save()
+    WRITER.commit()
+
+    if all_conflicts:
+        print('\n  Conflicts:')
+        for c in all_conflicts:
+            print(f'    ⚠️  {c}')
 
     print(f'\n{"─"*40}')
     print(f'Done: {success}/{len(txt_files)} files processed successfully.')
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+grade.py
+Scores quiz submissions against the answer keys build.py shuffles into
+its pages, and totals and grades the CA/Exam broadsheets in Notes/.
+
+Usage:
+    python grade.py quiz submissions.csv                     # -> submissions.results.csv
+    python grade.py quiz subs.csv --items items.csv          # plus per-question statistics
+    python grade.py broadsheet Notes/broadsheet_*.csv        # -> <name>.graded.csv beside each
+    python grade.py broadsheet sheet.csv --exam Chemistry=subs.results.csv
+
+A submission export is a CSV whose header names at least Student ID,
+Page and Answers. Page is the page as built (quiz-biology.html, or
+variants/quiz-biology-v01.html for a printed variant); Answers has one
+letter per question in page order, with '-', '.', '_' or a space for a
+question left blank. Exports with one column per question (Q1, Q2, ...)
+instead of Answers work too. Both inputs are streamed row by row.
+
+Keys for variants come from their .key.json files. Keys for the regular
+pages are rebuilt in memory with build.page_questions(), so no answer key
+for a page students can open is ever written to output/. The rebuild is
+only trusted while output/.build-manifest.json says the page came from
+the same flags (--dedup, --assets), page layout (subjects, their order
+and section sizes), bank files and shuffling code as the tree grade.py
+runs in; otherwise its rows are reported, not scored.
+Grade from the checkout the pages were deployed from.
+"""
+
+import re
+import csv
+import sys
+import json
+import argparse
+from itertools import compress, repeat
+from operator import eq, ne
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from output_writer import WRITER
+from validate import Issue, print_issues
+
+# WAEC bands: the lowest percentage that earns each grade.
+GRADES = ((75, 'A1'), (70, 'B2'), (65, 'B3'), (60, 'C4'), (55, 'C5'),
+          (50, 'C6'), (45, 'D7'), (40, 'E8'), (0, 'F9'))
+BLANKS = '-._ '
+_BLANK_TABLE = str.maketrans({c: '-' for c in BLANKS[1:]})
+_QUESTION_COL_RE = re.compile(r'^q?(\d+)$')
+
+
+def grade(percent: float) -> str:
+    for floor, letter in GRADES:
+        if percent >= floor:
+            return letter
+    return GRADES[-1][1]
+
+
+def _column(name: str) -> str:
+    """Header cell -> comparable name: 'Student ID', 'student_id' -> 'studentid'."""
+    return re.sub(r'[\s_]+', '', name.lstrip('﻿')).lower()
+
+
+def _number(cell: str) -> float | int | None:
+    cell = cell.strip()
+    if not cell:
+        return None
+    value = float(cell)
+    return int(value) if value.is_integer() else value
+
+
+def _fmt(value: float | int | None) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        return f'{value:.2f}'.rstrip('0').rstrip('.')
+    return str(value)
+
+
+# ── Answer keys ───────────────────────────────────────────────────────────────
+def page_name(page: str) -> str:
+    """'output/quiz-biology', 'quiz-biology.html' -> 'quiz-biology.html'."""
+    page = page.strip().replace('\\', '/').removeprefix('./').removeprefix('output/')
+    return page if page.endswith('.html') else page + '.html'
+
+
+class AnswerKeys:
+    """
+    page -> build.answer_key() records, loaded or rebuilt on first use.
+    A page whose key cannot be trusted raises KeyError with the reason.
+    """
+
+    def __init__(self, output_dir: str = 'output'):
+        self.output_dir = Path(output_dir)
+        self._keys: dict[str, tuple[str, list[dict], list[tuple[str, list[bool]]]]] = {}
+        self._manifest = None
+        self._same_order = False
+        self._banks: dict[str, str | None] = {}
+
+    def _bank_hash(self, subject: str) -> str | None:
+        import build
+        if subject not in self._banks:
+            self._banks[subject] = build.RAW_QUESTIONS.file_hash(subject) if subject in build.RAW_QUESTIONS else None
+        return self._banks[subject]
+
+    def _load(self, page: str) -> list[dict]:
+        key_file = self.output_dir / (page[:-len('.html')] + '.key.json')
+        if key_file.exists():
+            return json.loads(key_file.read_text(encoding='utf-8'))['questions']
+        import build
+        if self._manifest is None:
+            self._manifest = build.load_manifest(str(self.output_dir))
+            self._same_order = self._manifest.get('order') == build.order_hash()
+        entry = self._manifest.get('pages', {}).get(page)
+        if entry is None:
+            raise KeyError(f'no answer key for page {page!r}')
+        flags = entry.get('build')
+        if flags is None:
+            raise KeyError(f'{page} was built before the manifest recorded how; rebuild it to grade it')
+        if not self._same_order:
+            raise KeyError(f'{page} was shuffled by a different version of build.py')
+        changed = [s for s, h in entry['banks'].items() if self._bank_hash(s) != h]
+        if changed:
+            raise KeyError(f'the {", ".join(changed)} bank has changed since {page} was built')
+        spec = next((s for s in build.page_specs(dedup=flags['dedup']) if f'{s["name"]}.html' == page), None)
+        if spec is None:
+            raise KeyError(f'{page} is no longer one of build.py\'s pages')
+        spec['assets'] = flags['assets']
+        if entry.get('spec') != build.spec_order_key(spec):
+            raise KeyError(f'{page} has different subjects, sections or order in build.py than when it was built')
+        questions = build.page_questions(spec)
+        if len(questions) != entry['questions']:
+            raise KeyError(f'{page} had {entry["questions"]} questions; rebuilding it gives {len(questions)}')
+        return build.answer_key(questions)
+
+    def __getitem__(self, page: str) -> tuple[str, list[dict], list[tuple[str, list[bool]]]]:
+        """
+        (answer letters in page order, the key records, and per subject a
+        mask of the questions that belong to it) for page.
+        """
+        entry = self._keys.get(page)
+        if entry is None:
+            records = self._load(page)
+            subjects = list(dict.fromkeys(r['subject'] for r in records))
+            masks = [(s, [r['subject'] == s for r in records]) for s in subjects]
+            entry = self._keys[page] = (''.join(r['answer'] or '?' for r in records), records, masks)
+        return entry
+
+
+# ── Quiz submissions ──────────────────────────────────────────────────────────
+class ItemStats:
+    """Per-question tallies for one page, accumulated a student at a time."""
+
+    def __init__(self, n: int):
+        self.students = 0
+        self.answered = [0] * n
+        self.correct  = [0] * n
+
+    def add(self, answers: str, hits: list[bool]) -> None:
+        self.students += 1
+        for i in compress(range(len(hits)), hits):
+            self.correct[i] += 1
+        for i in compress(range(len(answers)), map(ne, answers, repeat('-'))):
+            self.answered[i] += 1
+
+
+RESULT_HEADER = ['Student ID', 'Student Name', 'Page', 'Questions', 'Answered', 'Correct',
+                 'Percent', 'Grade', 'Subjects']
+
+
+class Submission(NamedTuple):
+    student_id: str
+    name:       str
+    page:       str
+    answers:    str           # one letter (or '-') per question on the page
+    hits:       list[bool]    # answers[i] == key[i]
+
+
+def iter_submissions(paths: list[Path], keys: AnswerKeys, issues: list[Issue]) -> Iterator[Submission]:
+    """Every scoreable row of every export, in order; rows that are not go to issues."""
+    for path in paths:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = [_column(c) for c in next(reader, [])]
+            try:
+                sid, page_col = header.index('studentid'), header.index('page')
+            except ValueError:
+                issues.append(Issue(str(path), 1, 'header needs Student ID and Page columns'))
+                continue
+            name_col = next((header.index(c) for c in ('studentname', 'name') if c in header), None)
+            if 'answers' in header:
+                answer_cols = None
+                ans_col = header.index('answers')
+            else:
+                numbered = sorted((int(m.group(1)), i) for i, c in enumerate(header)
+                                  if (m := _QUESTION_COL_RE.match(c)))
+                answer_cols = [i for _, i in numbered]
+                if not answer_cols:
+                    issues.append(Issue(str(path), 1, 'header needs an Answers column or Q1, Q2, ... columns'))
+                    continue
+
+            for line, row in enumerate(reader, start=2):
+                if not any(row):
+                    continue
+                page = page_name(row[page_col])
+                try:
+                    key = keys[page][0]
+                except KeyError as e:
+                    issues.append(Issue(str(path), line, e.args[0]))
+                    continue
+                if answer_cols is None:
+                    answers = row[ans_col].upper().translate(_BLANK_TABLE)
+                else:
+                    answers = ''.join((row[i].strip().upper() or '-') if i < len(row) else '-'
+                                      for i in answer_cols).translate(_BLANK_TABLE)
+                if len(answers) > len(key):
+                    issues.append(Issue(str(path), line,
+                                        f'{len(answers)} answers for {len(key)} questions on {page}'))
+                    answers = answers[:len(key)]
+                answers = answers.ljust(len(key), '-')
+                yield Submission(row[sid], row[name_col] if name_col is not None else '', page,
+                                 answers, list(map(eq, answers, key)))
+
+
+def grade_submissions(paths: list[Path], keys: AnswerKeys, out,
+                      items: dict[str, ItemStats], issues: list[Issue]) -> int:
+    """Score every row of every export and write one result row each. Returns the row count."""
+    writer = csv.writer(out)
+    writer.writerow(RESULT_HEADER)
+    rows = 0
+    for sub in iter_submissions(paths, keys, issues):
+        hits = sub.hits
+        masks = keys[sub.page][2]
+        correct = sum(hits)
+        answered = len(sub.answers) - sub.answers.count('-')
+        percent = 100 * correct / len(hits) if hits else 0.0
+        stats = items.get(sub.page)
+        if stats is None:
+            stats = items[sub.page] = ItemStats(len(hits))
+        stats.add(sub.answers, hits)
+
+        writer.writerow([sub.student_id, sub.name, sub.page, len(hits), answered, correct,
+                         f'{percent:.1f}', grade(percent),
+                         ';'.join(f'{s}={sum(compress(hits, m))}/{sum(m)}' for s, m in masks)])
+        rows += 1
+    return rows
+
+
+def write_items(path: str, keys: AnswerKeys, items: dict[str, ItemStats]) -> None:
+    with WRITER.open(path) as f:
+        writer = csv.writer(f)
+        writer.writerow(['Page', 'Q', 'Subject', 'Bank ID', 'Key', 'Students', 'Answered', 'Correct', 'P'])
+        for page, stats in sorted(items.items()):
+            key, records, _ = keys[page]
+            for i, r in enumerate(records):
+                p = stats.correct[i] / stats.students if stats.students else 0.0
+                writer.writerow([page, r['id'], r['subject'], r['bank_id'], key[i], stats.students,
+                                 stats.answered[i], stats.correct[i], f'{p:.3f}'])
+
+
+def load_results(path: str) -> dict[str, float]:
+    """Student ID -> best percent from a results CSV written by `grade.py quiz`."""
+    best = {}
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            sid, percent = row['Student ID'].strip(), float(row['Percent'])
+            best[sid] = max(percent, best.get(sid, percent))
+    return best
+
+
+# ── Broadsheets ───────────────────────────────────────────────────────────────
+class Broadsheet:
+    """
+    Column layout of a broadsheet: S/N, Student ID, Student Name, then a
+    CA/Exam/Total triple per subject under a three-row header (subject
+    names, components, "Max →" with each component's maximum), then Sum
+    of Totals and Overall Grade.
+    """
+
+    def __init__(self, header: list[list[str]]):
+        names, parts, maxima = (row + [''] * (len(header[0]) - len(row)) for row in header)
+        self.width = len(names)
+        self.id_col = next(i for i, c in enumerate(names) if _column(c) == 'studentid')
+        self.subjects: list[tuple[str, int, int, int]] = []   # name, first column, CA max, Exam max
+        for i, name in enumerate(names):
+            if name and parts[i] == 'CA' and parts[i + 1:i + 3] == ['Exam', 'Total']:
+                self.subjects.append((name, i, _number(maxima[i]) or 0, _number(maxima[i + 1]) or 0))
+        self.sum_col = names.index('Sum of Totals')
+        self.grade_col = names.index('Overall Grade')
+
+
+def grade_broadsheet(path: Path, out_path: Path, exams: dict[str, dict[str, float]],
+                     issues: list[Issue]) -> dict[str, int]:
+    """
+    Recompute every Total, the Sum of Totals and the Overall Grade (the
+    sum averaged over every subject on the sheet), optionally taking a
+    subject's Exam score from quiz results. Returns grade -> student count.
+    """
+    source = path.name
+    grades: dict[str, int] = {}
+    with open(path, newline='', encoding='utf-8-sig') as f, WRITER.open(str(out_path)) as out:
+        reader = csv.reader(f)
+        header = [next(reader) for _ in range(3)]
+        sheet = Broadsheet(header)
+        for name in exams:
+            if name not in {s[0] for s in sheet.subjects}:
+                issues.append(Issue(source, 1, f'--exam subject {name!r} is not on this sheet'))
+        writer = csv.writer(out)
+        out.write('﻿')
+        writer.writerows(header)
+
+        for line, row in enumerate(reader, start=4):
+            row += [''] * (sheet.width - len(row))
+            sid = row[sheet.id_col].strip()
+            total_sum, taken = 0, 0
+            for name, col, max_ca, max_exam in sheet.subjects:
+                try:
+                    ca, exam, given = (_number(c) for c in row[col:col + 3])
+                except ValueError:
+                    issues.append(Issue(source, line, f'{name}: scores are not numbers'))
+                    continue
+                percent = exams.get(name, {}).get(sid)
+                if percent is not None:
+                    exam = round(percent * max_exam / 100)
+                    row[col + 1] = _fmt(exam)
+                if ca is None and exam is None:
+                    if given is not None:
+                        issues.append(Issue(source, line, f'{name}: Total {_fmt(given)} without CA or Exam'))
+                    continue
+                if ca is not None and ca > max_ca:
+                    issues.append(Issue(source, line, f'{name}: CA {_fmt(ca)} is over {_fmt(max_ca)}'))
+                if exam is not None and exam > max_exam:
+                    issues.append(Issue(source, line, f'{name}: Exam {_fmt(exam)} is over {_fmt(max_exam)}'))
+                total = (ca or 0) + (exam or 0)
+                if given is not None and given != total and percent is None:
+                    issues.append(Issue(source, line, f'{name}: Total was {_fmt(given)}, CA + Exam is {_fmt(total)}'))
+                row[col + 2] = _fmt(total)
+                total_sum += total
+                taken += 1
+            if taken:
+                letter = grade(total_sum / len(sheet.subjects))
+                row[sheet.sum_col], row[sheet.grade_col] = _fmt(total_sum), letter
+                grades[letter] = grades.get(letter, 0) + 1
+            else:
+                row[sheet.sum_col] = row[sheet.grade_col] = ''
+            writer.writerow(row)
+    return grades
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def run_quiz(args: argparse.Namespace) -> list[Issue]:
+    paths = [Path(p) for p in args.files]
+    out_path = args.out or str(paths[0].with_suffix('.results.csv'))
+    keys = AnswerKeys(args.output_dir)
+    items: dict[str, ItemStats] = {}
+    issues: list[Issue] = []
+    with WRITER.open(out_path) as out:
+        rows = grade_submissions(paths, keys, out, items, issues)
+    if args.items:
+        write_items(args.items, keys, items)
+    WRITER.commit()
+    print(f'📝 {rows} submissions on {len(items)} page(s) → {out_path}')
+    if args.items:
+        print(f'📊 Item statistics → {args.items}')
+    return issues
+
+
+def run_broadsheet(args: argparse.Namespace) -> list[Issue]:
+    exams = {}
+    for spec in args.exam:
+        subject, sep, results = spec.partition('=')
+        if not sep:
+            sys.exit(f'--exam takes SUBJECT=results.csv, got {spec!r}')
+        exams[subject] = load_results(results)
+    issues: list[Issue] = []
+    for path in map(Path, args.files):
+        out_dir = Path(args.out_dir) if args.out_dir else path.parent
+        out_path = out_dir / f'{path.stem}.graded.csv'
+        grades = grade_broadsheet(path, out_path, exams, issues)
+        spread = '  '.join(f'{g}×{grades[g]}' for _, g in GRADES if g in grades) or 'no scores yet'
+        print(f'📋 {path.name}: {sum(grades.values())} graded  {spread}  → {out_path}')
+    WRITER.commit()
+    return issues
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Grade quiz submissions and CA/Exam broadsheets.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('quiz', help='score submission exports against the pages\' answer keys')
+    p.add_argument('files', nargs='+', help='submission CSV exports')
+    p.add_argument('-o', '--out', help='results CSV (default: <first file>.results.csv)')
+    p.add_argument('--items', metavar='PATH', help='also write per-question statistics to PATH')
+    p.add_argument('--output-dir', default='output', help='where build.py wrote the pages (default output)')
+    p.set_defaults(run=run_quiz)
+
+    p = sub.add_parser('broadsheet', help='recompute totals, sums and grades of broadsheet CSVs')
+    p.add_argument('files', nargs='+', help='broadsheet CSVs (e.g. Notes/broadsheet_*.csv)')
+    p.add_argument('--out-dir', help='where to write <name>.graded.csv (default: beside each input)')
+    p.add_argument('--exam', action='append', default=[], metavar='SUBJECT=RESULTS',
+                   help='fill SUBJECT\'s Exam column from a `grade.py quiz` results CSV, '
+                        'scaled to its maximum (repeatable)')
+    p.set_defaults(run=run_broadsheet)
+
+    args = parser.parse_args()
+    issues = args.run(args)
+    if issues:
+        print()
+        print_issues(issues)
+        print(f'\n⚠️  {len(issues)} problem(s) — see above')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+instrument.py
+Opt-in per-stage instrumentation for build.py and generate_quiz.py.
+
+Code marks its stages:
+
+    with instrument.stage('shuffle'):
+        questions = prepare_questions(...)
+
+and a run wrapped in session() gets a JSON report of wall time,
+allocations and bytes written per stage, plus an optional cProfile dump:
+
+    python build.py --profile build-profile.json --cprofile build.prof
+    python generate_quiz.py --profile inject-profile.json
+
+Stages nest. A stage's seconds exclude the stages nested inside it, so
+the per-stage times add up to the run; its allocation figures (net and
+peak, from tracemalloc) include them. Outside a session stage() is a
+shared no-op, so instrumented code costs next to nothing by default.
+"""
+
+import sys
+import json
+import time
+import cProfile
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPORT_VERSION = 1
+
+
+# ── Profiler ──────────────────────────────────────────────────────────────────
+class _Frame:
+    __slots__ = ('name', 'start', 'children', 'mem_start', 'child_peak')
+
+    def __init__(self, name: str, mem_start: int):
+        self.name       = name
+        self.start      = time.perf_counter()
+        self.children   = 0.0
+        self.mem_start  = mem_start
+        self.child_peak = 0
+
+
+class Profiler:
+    """Per-stage totals for one run."""
+
+    def __init__(self, memory: bool = True):
+        self.memory  = memory
+        self.stats: dict[str, dict] = {}
+        self._stack: list[_Frame] = []
+        self.started = time.perf_counter()
+
+    def _totals(self, name: str) -> dict:
+        totals = self.stats.get(name)
+        if totals is None:
+            totals = self.stats[name] = {'calls': 0, 'seconds': 0.0, 'net_bytes': 0,
+                                         'peak_bytes': 0, 'bytes_written': 0}
+        return totals
+
+    @contextmanager
+    def stage(self, name: str):
+        mem_start = 0
+        if self.memory:
+            mem_start, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent.child_peak = max(parent.child_peak, peak)
+            tracemalloc.reset_peak()
+        frame = _Frame(name, mem_start)
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame.start
+            totals = self._totals(name)
+            totals['calls']   += 1
+            totals['seconds'] += elapsed - frame.children
+            if self._stack:
+                self._stack[-1].children += elapsed
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, frame.child_peak)
+                totals['net_bytes'] += current - frame.mem_start
+                totals['peak_bytes'] = max(totals['peak_bytes'], peak - frame.mem_start)
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent.child_peak = max(parent.child_peak, peak)
+                tracemalloc.reset_peak()
+
+    def wrote(self, nbytes: int, name: str | None = None) -> None:
+        """Credit nbytes of output to stage name (default: the innermost open stage)."""
+        if name is None:
+            name = self._stack[-1].name if self._stack else 'write'
+        self._totals(name)['bytes_written'] += nbytes
+
+    def report(self) -> dict:
+        wall = time.perf_counter() - self.started
+        return {
+            'wall_seconds':        wall,
+            'unaccounted_seconds': wall - sum(s['seconds'] for s in self.stats.values()),
+            'memory_traced':       self.memory,
+            'stages':              self.stats,
+        }
+
+
+class _TrackedFile:
+    """File proxy that times every write() as a 'write' stage."""
+
+    def __init__(self, f, profiler: Profiler):
+        self._f = f
+        self._profiler = profiler
+
+    def write(self, s):
+        with self._profiler.stage('write'):
+            return self._f.write(s)
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+
+# ── Module-level hooks ────────────────────────────────────────────────────────
+_active: Profiler | None = None
+_NOOP = nullcontext()
+
+
+def stage(name: str):
+    """Context manager timing one stage; a no-op unless a session is running."""
+    return _NOOP if _active is None else _active.stage(name)
+
+
+def wrote(nbytes: int, name: str | None = None) -> None:
+    if _active is not None:
+        _active.wrote(nbytes, name)
+
+
+def tracked(f):
+    """f itself, or a proxy that times its writes while a session is running."""
+    return f if _active is None else _TrackedFile(f, _active)
+
+
+def enabled() -> bool:
+    return _active is not None
+
+
+# ── Session ───────────────────────────────────────────────────────────────────
+@contextmanager
+def session(report: str | None = None, cprofile: str | None = None, memory: bool = True):
+    """
+    Instrument everything run inside the block. On exit (even via
+    sys.exit) writes the JSON report to report and the cProfile stats to
+    cprofile; with neither given the block runs uninstrumented.
+    """
+    global _active
+    if not (report or cprofile):
+        yield None
+        return
+
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        started_tracing = True
+    else:
+        started_tracing = False
+        memory = memory and tracemalloc.is_tracing()
+    profiler = _active = Profiler(memory=memory)
+    cprof = cProfile.Profile() if cprofile else None
+    stamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    try:
+        if cprof:
+            cprof.enable()
+        try:
+            yield profiler
+        finally:
+            if cprof:
+                cprof.disable()
+    finally:
+        _active = None
+        if started_tracing:
+            tracemalloc.stop()
+        if cprof:
+            cprof.dump_stats(cprofile)
+        data = {'version': REPORT_VERSION, 'script': Path(sys.argv[0]).name,
+                'argv': sys.argv[1:], 'started': stamp, 'cprofile': cprofile}
+        data.update(profiler.report())
+        if report:
+            Path(report).write_text(json.dumps(data, indent=2) + '\n', encoding='utf-8')
+        print_summary(data, report)
+
+
+def print_summary(data: dict, report: str | None = None) -> None:
+    print(f'\n📊 {data["wall_seconds"] * 1000:.0f} ms total')
+    for name, s in sorted(data['stages'].items(), key=lambda kv: -kv[1]['seconds']):
+        line = f'  {name:<10} {s["seconds"] * 1000:9.1f} ms  ×{s["calls"]:<6}'
+        if data['memory_traced']:
+            line += f' {s["peak_bytes"] / 1024:9.1f} KiB peak'
+        if s['bytes_written']:
+            line += f' {s["bytes_written"] / 1024:9.1f} KiB written'
+        print(line)
+    if report:
+        print(f'  Report written to {report}')
+    if data['cprofile']:
+        print(f'  cProfile stats written to {data["cprofile"]}')
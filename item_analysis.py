@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+item_analysis.py
+Difficulty, discrimination and distractor statistics for every bank
+question students have answered, from the submission exports grade.py
+scores.
+
+Usage:
+    python item_analysis.py submissions.csv                 # -> item-analysis.json
+    python item_analysis.py subs/*.csv --csv items.csv      # plus a spreadsheet-friendly table
+    python build.py --item-report item-analysis.json        # flag weak items while building
+
+One pass over the exports keeps, per page, the student count and the
+sums of scores and squared scores, and per question on the page the
+number correct, the score total of those students and how often each
+option letter was picked. Memory grows with the number of questions,
+never with the number of students.
+
+Each question is reported once per bank question (subject + bank id),
+pooled over every page and variant that carried it:
+    p        share of students who got it right (difficulty)
+    rpb      corrected point-biserial: the correlation between getting it
+             right and the score on the rest of the page (discrimination)
+    options  share of students picking each option, by its label in the
+             bank; the page's shuffle is undone through the key's perm
+"""
+
+import csv
+import json
+import argparse
+from datetime import datetime, timezone
+from itertools import compress, repeat
+from math import sqrt
+from operator import eq
+from pathlib import Path
+
+from grade import AnswerKeys, iter_submissions
+from output_writer import WRITER
+from validate import Issue, print_issues
+
+REPORT_VERSION = 1
+LABELS = ('A', 'B', 'C', 'D')
+
+THRESHOLDS = {
+    'min_students':   30,     # fewer answers than this: report, but do not flag
+    'hard_p':         0.20,
+    'easy_p':         0.90,
+    'min_rpb':        0.20,
+    'min_distractor': 0.05,   # a wrong option almost nobody picks is not doing its job
+}
+
+
+# ── Streaming pass ────────────────────────────────────────────────────────────
+class PageTally:
+    """Running sums for one page; O(questions on the page)."""
+
+    def __init__(self, size: int):
+        self.n      = 0
+        self.sum    = 0
+        self.sum_sq = 0
+        self.correct          = [0] * size
+        self.score_if_correct = [0] * size
+        self.picks = {label: [0] * size for label in LABELS}
+
+    def add(self, answers: str, hits: list[bool]) -> None:
+        score = sum(hits)
+        self.n += 1
+        self.sum += score
+        self.sum_sq += score * score
+        for i in compress(range(len(hits)), hits):
+            self.correct[i] += 1
+            self.score_if_correct[i] += score
+        for label, counts in self.picks.items():
+            for i in compress(range(len(answers)), map(eq, answers, repeat(label))):
+                counts[i] += 1
+
+
+class ItemTotals:
+    """
+    Pooled sums for one bank question. x is 1 if the student got it
+    right; y is their score on the rest of the page, as a fraction, so
+    pages of different lengths pool together.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.n = 0
+        self.sx = self.sy = self.syy = self.sxy = 0.0
+        self.picks = dict.fromkeys(LABELS, 0)
+        self.pages = set()
+
+    def fold(self, page: str, tally: PageTally, i: int, size: int, perm: str) -> None:
+        # Rest score of one student: (score - x) / (size - 1). Its sums over
+        # the page's students follow from the page and question totals.
+        d = max(size - 1, 1)
+        c, s = tally.correct[i], tally.score_if_correct[i]
+        self.n   += tally.n
+        self.sx  += c
+        self.sy  += (tally.sum - c) / d
+        self.syy += (tally.sum_sq - 2 * s + c) / (d * d)
+        self.sxy += (s - c) / d
+        for new, original in zip(LABELS, perm):
+            self.picks[original] += tally.picks[new][i]
+        self.pages.add(page)
+
+    def stats(self) -> dict:
+        n = self.n
+        p = self.sx / n if n else None
+        den = (n * self.sx - self.sx ** 2) * (n * self.syy - self.sy ** 2)
+        rpb = (n * self.sxy - self.sx * self.sy) / sqrt(den) if den > 1e-12 else None
+        options = {label: round(count / n, 4) if n else 0.0 for label, count in self.picks.items()}
+        return {
+            'n':       n,
+            'p':       round(p, 4) if p is not None else None,
+            'rpb':     round(rpb, 4) if rpb is not None else None,
+            'key':     self.key,
+            'options': options,
+            'omitted': round(1 - sum(self.picks.values()) / n, 4) if n else 0.0,
+            'pages':   sorted(self.pages),
+        }
+
+
+def item_flags(stats: dict, limits: dict = THRESHOLDS) -> list[str]:
+    if stats['n'] < limits['min_students']:
+        return []
+    flags = []
+    p, rpb = stats['p'], stats['rpb']
+    if p < limits['hard_p']:
+        flags.append('hard')
+    elif p > limits['easy_p']:
+        flags.append('easy')
+    if rpb is not None and rpb < 0:
+        flags.append('negative discrimination')
+    elif rpb is not None and rpb < limits['min_rpb']:
+        flags.append('low discrimination')
+    for label, share in stats['options'].items():
+        if label == stats['key']:
+            continue
+        if share > p:
+            flags.append(f'distractor {label} beats the key')
+        elif share < limits['min_distractor']:
+            flags.append(f'distractor {label} rarely chosen')
+    return flags
+
+
+def analyse(paths: list[Path], keys: AnswerKeys, issues: list[Issue]) -> tuple[int, dict]:
+    """One pass over the exports. Returns (students, (subject, bank id) -> ItemTotals)."""
+    tallies: dict[str, PageTally] = {}
+    students = 0
+    for sub in iter_submissions(paths, keys, issues):
+        tally = tallies.get(sub.page)
+        if tally is None:
+            tally = tallies[sub.page] = PageTally(len(sub.hits))
+        tally.add(sub.answers, sub.hits)
+        students += 1
+
+    items: dict[tuple[str, int], ItemTotals] = {}
+    for page, tally in sorted(tallies.items()):
+        records = keys[page][1]
+        for i, r in enumerate(records):
+            perm = r['perm']
+            ident = (r['subject'], r['bank_id'])
+            item = items.get(ident)
+            if item is None:
+                key = perm[LABELS.index(r['answer'])] if r['answer'] in LABELS else None
+                item = items[ident] = ItemTotals(key)
+            item.fold(page, tally, i, len(records), perm)
+    return students, items
+
+
+# ── Report ────────────────────────────────────────────────────────────────────
+def build_report(paths: list[Path], students: int, items: dict) -> dict:
+    import build
+    from dedup import question_key
+
+    entries = []
+    for (subject, bank_id), totals in sorted(items.items()):
+        entry = {'subject': subject, 'bank_id': bank_id}
+        if subject in build.RAW_QUESTIONS and bank_id <= len(build.RAW_QUESTIONS[subject]):
+            q = build.RAW_QUESTIONS[subject].by_id(bank_id)
+            entry['fingerprint'] = question_key(q)
+            entry['text'] = ' '.join(q['text'].split())[:80]
+        entry.update(totals.stats())
+        entry['flags'] = item_flags(entry)
+        entries.append(entry)
+    return {
+        'version':    REPORT_VERSION,
+        'created':    datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'sources':    [str(p) for p in paths],
+        'students':   students,
+        'thresholds': THRESHOLDS,
+        'items':      entries,
+    }
+
+
+CSV_HEADER = ['Subject', 'Bank ID', 'N', 'P', 'RPB', 'Key', 'A', 'B', 'C', 'D', 'Omitted', 'Flags', 'Text']
+
+
+def write_csv(path: str, report: dict) -> None:
+    with WRITER.open(path) as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for e in report['items']:
+            writer.writerow([e['subject'], e['bank_id'], e['n'], e['p'], '' if e['rpb'] is None else e['rpb'],
+                             e['key'] or '', *(e['options'][label] for label in LABELS), e['omitted'],
+                             '; '.join(e['flags']), e.get('text', '')])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Per-question difficulty, discrimination and distractor usage.')
+    parser.add_argument('files', nargs='+', help='submission CSV exports (the format grade.py quiz reads)')
+    parser.add_argument('-o', '--out', default='item-analysis.json',
+                        help='JSON report, readable by build.py --item-report (default item-analysis.json)')
+    parser.add_argument('--csv', metavar='PATH', help='also write the per-question table as CSV')
+    parser.add_argument('--output-dir', default='output', help='where build.py wrote the pages (default output)')
+    args = parser.parse_args()
+
+    paths = [Path(f) for f in args.files]
+    issues: list[Issue] = []
+    students, items = analyse(paths, AnswerKeys(args.output_dir), issues)
+    report = build_report(paths, students, items)
+    WRITER.write_text(args.out, json.dumps(report, indent=1, ensure_ascii=False) + '\n')
+    if args.csv:
+        write_csv(args.csv, report)
+    WRITER.commit()
+
+    flagged = [e for e in report['items'] if e['flags']]
+    print(f'🔬 {students} submissions, {len(items)} questions, {len(flagged)} flagged → {args.out}')
+    for e in flagged[:20]:
+        print(f'  ⚠️  {e["subject"]} #{e["bank_id"]} (p={e["p"]}, rpb={e["rpb"]}): {", ".join(e["flags"])}')
+    if len(flagged) > 20:
+        print(f'  … and {len(flagged) - 20} more')
+    if issues:
+        print()
+        print_issues(issues)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+output_writer.py
+Atomic, skip-if-identical output for build.py and generate_quiz.py.
+
+Every file is written to a temporary sibling and renamed over its target,
+so a reader (or a deploy copying the output directory) sees either the
+old file or the new one, never half of one. Content identical to what is
+already on disk is not rewritten at all, which keeps mtimes, caches and
+rsync deltas quiet. fsync is deferred: commit() flushes every file
+written since the last commit, then their directories, in one batch at
+the end of a run.
+"""
+
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import instrument
+
+# mkstemp creates files 0600; published pages need the usual umask-based mode.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_CHUNK = 1 << 20
+
+
+def _same_bytes(path: str, data: bytes) -> bool:
+    """True if the file at path holds exactly data."""
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size != len(data):
+                return False
+            view = memoryview(data)
+            for pos in range(0, len(data), _CHUNK):
+                if f.read(_CHUNK) != view[pos:pos + _CHUNK]:
+                    return False
+            return True
+    except FileNotFoundError:
+        return False
+
+
+def _same_file(a: str, b: str) -> bool:
+    """True if the files at a and b have identical bytes."""
+    try:
+        with open(a, 'rb') as fa, open(b, 'rb') as fb:
+            if os.fstat(fa.fileno()).st_size != os.fstat(fb.fileno()).st_size:
+                return False
+            for block in iter(lambda: fa.read(_CHUNK), b''):
+                if fb.read(_CHUNK) != block:
+                    return False
+            return True
+    except FileNotFoundError:
+        return False
+
+
+class OutputWriter:
+    """Writes files atomically, skips identical ones, and fsyncs them on commit()."""
+
+    def __init__(self):
+        self.pending: set[str] = set()
+        self.pending_dirs: set[str] = set()
+        self.written = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def _temp(self, path: str) -> tuple[int, str]:
+        directory, name = os.path.split(os.path.abspath(path))
+        return tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=directory)
+
+    def _publish(self, tmp: str, path: str, nbytes: int) -> None:
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+        instrument.wrote(nbytes)
+        with self._lock:
+            self.pending.add(os.path.abspath(path))
+            self.written += 1
+
+    def _skip(self) -> None:
+        with self._lock:
+            self.skipped += 1
+
+    def write_bytes(self, path: str, data: bytes) -> bool:
+        """Replace path with data unless it already holds it. Returns True if written."""
+        if _same_bytes(path, data):
+            self._skip()
+            return False
+        fd, tmp = self._temp(path)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            self._publish(tmp, path, len(data))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return True
+
+    def write_text(self, path: str, text: str) -> bool:
+        """write_bytes for UTF-8 text; newlines are written as-is."""
+        return self.write_bytes(path, text.encode('utf-8'))
+
+    @contextmanager
+    def open(self, path: str, mode: str = 'w'):
+        """
+        Stream into a temporary file that replaces path on a clean exit
+        (and is discarded if it turns out identical to path, or on error).
+        mode is 'w' for UTF-8 text or 'wb'.
+        """
+        fd, tmp = self._temp(path)
+        try:
+            if mode == 'wb':
+                f = os.fdopen(fd, 'wb')
+            else:
+                f = os.fdopen(fd, 'w', encoding='utf-8', newline='')
+            with f:
+                yield f
+            if _same_file(tmp, path):
+                os.remove(tmp)
+                self._skip()
+            else:
+                self._publish(tmp, path, os.path.getsize(tmp))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def remove(self, path: str) -> None:
+        os.remove(path)
+        with self._lock:
+            self.pending.discard(os.path.abspath(path))
+            self.pending_dirs.add(os.path.dirname(os.path.abspath(path)))
+
+    def track(self, path: str) -> None:
+        """Have commit() also sync a file written elsewhere, e.g. by a worker process."""
+        with self._lock:
+            self.pending.add(os.path.abspath(path))
+
+    def commit(self) -> int:
+        """fsync every pending file, then each of their directories. Returns the file count."""
+        with self._lock:
+            files, self.pending = sorted(self.pending), set()
+            dirs, self.pending_dirs = self.pending_dirs, set()
+        dirs.update(os.path.dirname(p) for p in files)
+        with instrument.stage('fsync'):
+            for path in files:
+                try:
+                    fd = os.open(path, os.O_RDONLY)
+                except FileNotFoundError:
+                    continue
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            for directory in sorted(dirs):
+                try:
+                    fd = os.open(directory, os.O_RDONLY)
+                except OSError:     # e.g. directories cannot be opened on Windows
+                    continue
+                try:
+                    os.fsync(fd)
+                except OSError:
+                    pass
+                finally:
+                    os.close(fd)
+        return len(files)
+
+
+# Process-wide writer; worker processes get their own copy, so the parent
+# track()s what they produced before committing.
+WRITER = OutputWriter()
@@ -0,0 +1,92 @@
+// quiz-search.js - Offline question search over the index from `build.py --search`
+
+// Usage (from a page next to the search/ folder):
+//   const search = await QuizSearch.open('search/');
+//   const hits = await search.query('photosynth chlorophyll');
+//   // -> [{ subject, id, title, page }, ...]   id = question number in the subject bank
+//
+// Every query word is a prefix; a question must match all of them.
+(function (root) {
+    'use strict';
+
+    // Same tokens as build.py's WORD_RE over lowercased text
+    const WORD = /[\p{L}\p{N}_]+/gu;
+    const DIGITS = /^\p{N}+$/u;
+
+    // Query words, minus the ones question_tokens never indexes (the rules come
+    // from index.json, so both sides drop the same words)
+    function words(text, index = {}) {
+        const stop = new Set(index.stopwords || []);
+        const min = index.min_length || 1;
+        return (text.toLowerCase().match(WORD) || [])
+            .filter(w => (w.length >= min || DIGITS.test(w)) && !stop.has(w));
+    }
+
+    // First index in sorted `tokens` whose token is >= `prefix`
+    function lowerBound(tokens, prefix) {
+        let lo = 0, hi = tokens.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (tokens[mid] < prefix) lo = mid + 1;
+            else hi = mid;
+        }
+        return lo;
+    }
+
+    // Ids of every question holding a token that starts with `prefix`
+    function prefixIds(shard, prefix) {
+        const found = new Set();
+        for (let i = lowerBound(shard.tokens, prefix);
+             i < shard.tokens.length && shard.tokens[i].startsWith(prefix); i++) {
+            let id = 0;
+            for (const delta of shard.postings[i]) {
+                id += delta;
+                found.add(id);
+            }
+        }
+        return found;
+    }
+
+    // Ascending ids of the questions in one shard matching every word of `text`
+    function queryShard(shard, text, index) {
+        const terms = words(text, index);
+        if (!terms.length) return [];
+        let hits = null;
+        for (const term of terms) {
+            const ids = prefixIds(shard, term);
+            hits = hits === null ? ids : new Set([...hits].filter(id => ids.has(id)));
+            if (!hits.size) return [];
+        }
+        return [...hits].sort((a, b) => a - b);
+    }
+
+    async function open(base = 'search/') {
+        const index = await (await fetch(base + 'index.json')).json();
+        const shards = {};
+
+        // Shards are fetched on first use and kept
+        function shard(subject) {
+            if (!shards[subject]) {
+                shards[subject] = fetch(base + index.subjects[subject].file).then(r => r.json());
+            }
+            return shards[subject];
+        }
+
+        async function query(text, subjects = Object.keys(index.subjects)) {
+            const lists = await Promise.all(subjects.map(async subject => {
+                const s = await shard(subject);
+                return queryShard(s, text, index).map(id => ({
+                    subject: subject,
+                    id: id,
+                    title: s.titles[id - 1],
+                    page: index.subjects[subject].page
+                }));
+            }));
+            return lists.flat();
+        }
+
+        return { index: index, query: query };
+    }
+
+    root.QuizSearch = { open: open, queryShard: queryShard };
+})(typeof self !== 'undefined' ? self : this);
@@ -0,0 +1,81 @@
+"""grade.AnswerKeys must rebuild the key a page was built with, or refuse it."""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import build
+from dedup import question_key
+from grade import AnswerKeys
+
+NODE = shutil.which('node')
+
+
+def asset_page_answers(spec: dict, output_dir) -> str:
+    """The answer letters an --assets page shows, from the data files it loads."""
+    (output_dir / build.DATA_DIR).mkdir(exist_ok=True)
+    js = 'var self = globalThis;\n'
+    for subj in spec['subjects']:
+        _, name, _ = build.render_asset({'subject': subj, 'dedup': spec['dedup']}, str(output_dir))
+        js += (output_dir / name).read_text(encoding='utf-8')
+    picks = {s: p for s in spec['subjects'] if (p := build.asset_section(spec, s)) is not None}
+    js += build.assets_loader_js(spec['subjects'], picks)
+    js += '\nprocess.stdout.write(QUESTIONS.map(function (q) { return q.answer; }).join(""));\n'
+    return subprocess.run([NODE, '-e', js], capture_output=True, text=True, check=True).stdout
+
+
+def write_manifest(output_dir, spec: dict, flags: dict, banks: dict) -> None:
+    entry = {'key': '', 'build': flags, 'spec': build.spec_order_key(spec), 'banks': banks,
+             'questions': len(build.page_questions(spec))}
+    manifest = {'version': build.MANIFEST_VERSION, 'order': build.order_hash(),
+                'pages': {f'{spec["name"]}.html': entry}}
+    (output_dir / build.MANIFEST_NAME).write_text(json.dumps(manifest), encoding='utf-8')
+
+
+@pytest.fixture(params=[None, 10], ids=['whole-banks', 'sampled'])
+def section_size(request, monkeypatch):
+    # The real banks are smaller than a section; 10 makes clusters sample.
+    if request.param is not None:
+        monkeypatch.setattr(build, 'DEFAULT_SECTION_SIZE', request.param)
+    return request.param
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+@pytest.mark.parametrize('dedup', [False, True], ids=['plain', 'dedup'])
+def test_asset_page_key(tmp_path, dedup, section_size):
+    spec = next(s for s in build.page_specs(dedup=dedup) if len(s['subjects']) > 1)
+    spec['assets'] = True
+    banks = {s: build.RAW_QUESTIONS.file_hash(s) for s in spec['subjects']}
+    write_manifest(tmp_path, spec, {'dedup': dedup, 'assets': True}, banks)
+    assert AnswerKeys(str(tmp_path))[f'{spec["name"]}.html'][0] == asset_page_answers(spec, tmp_path)
+
+
+@pytest.mark.parametrize('dedup', [False, True], ids=['plain', 'dedup'])
+def test_asset_cluster_matches_inline(dedup, section_size):
+    for spec in build.page_specs(dedup=dedup):
+        inline = build.page_questions(spec)
+        assets = build.page_questions(dict(spec, assets=True))
+        assert [(q.subject, question_key(q)) for q in assets] == [(q.subject, question_key(q)) for q in inline]
+
+
+def test_changed_bank_is_refused(tmp_path):
+    spec = build.page_specs()[0]
+    banks = {s: 'an older bank' for s in spec['subjects']}
+    write_manifest(tmp_path, spec, {'dedup': False, 'assets': False}, banks)
+    with pytest.raises(KeyError, match='has changed'):
+        AnswerKeys(str(tmp_path))[f'{spec["name"]}.html']
+
+
+def test_reordered_cluster_is_refused(tmp_path, monkeypatch):
+    name, cfg = next((n, c) for n, c in build.CLUSTERS.items() if len(c['use_subjects']) > 1)
+    spec = next(s for s in build.page_specs() if s['name'] == name)
+    banks = {s: build.RAW_QUESTIONS.file_hash(s) for s in spec['subjects']}
+    write_manifest(tmp_path, spec, {'dedup': False, 'assets': False}, banks)
+    assert AnswerKeys(str(tmp_path))[f'{name}.html']
+
+    # Same subjects, same size, another order: every answer moves.
+    monkeypatch.setitem(cfg, 'use_subjects', cfg['use_subjects'][::-1])
+    with pytest.raises(KeyError, match='different subjects'):
+        AnswerKeys(str(tmp_path))[f'{name}.html']
@@ -0,0 +1,27 @@
+"""The compact QUESTIONS format must decode to exactly the records the plain format writes."""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import build
+
+NODE = shutil.which('node')
+
+
+def evaluate(js: str) -> list:
+    script = js + '\nprocess.stdout.write(JSON.stringify(QUESTIONS));\n'
+    out = subprocess.run([NODE, '-e', script], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+@pytest.mark.parametrize('spec', build.page_specs(), ids=lambda spec: spec['name'])
+def test_compact_round_trip(spec):
+    questions = build.page_questions(spec)
+    plain = evaluate(build.questions_to_js(questions))
+    compact = evaluate(build.questions_to_js(questions, compact=True))
+    assert compact == plain
+    assert len(plain) == len(questions)
@@ -0,0 +1,86 @@
+"""item_analysis.analyse's streamed sums must give what the statistics give computed student by student."""
+
+import csv
+import random
+from math import sqrt
+
+import pytest
+
+from item_analysis import LABELS, analyse
+
+PERMS = ['ABCD', 'BCDA', 'DCAB', 'CADB', 'BADC']
+
+
+def make_page(rng: random.Random, bank_ids: list[int]) -> tuple[str, list[dict], list]:
+    """A key in the shape AnswerKeys gives: (letters, records, subject masks)."""
+    records = []
+    for i, bank_id in enumerate(bank_ids, start=1):
+        perm = rng.choice(PERMS)
+        answer = LABELS[perm.index('B')]      # every bank question's answer is B
+        records.append({'id': i, 'subject': 'Biology', 'bank_id': bank_id, 'perm': perm, 'answer': answer})
+    key = ''.join(r['answer'] for r in records)
+    return key, records, [('Biology', [True] * len(records))]
+
+
+def brute_force(rows: list[tuple[str, str]], keys: dict) -> dict[int, dict]:
+    """Per bank id: p, rpb and option shares, one student at a time."""
+    seen: dict[int, list[tuple[int, float, str]]] = {}
+    for page, answers in rows:
+        key, records, _ = keys[page]
+        score = sum(a == k for a, k in zip(answers, key))
+        size = len(records)
+        for i, r in enumerate(records):
+            x = int(answers[i] == key[i])
+            original = r['perm'][LABELS.index(answers[i])] if answers[i] in LABELS else None
+            seen.setdefault(r['bank_id'], []).append((x, (score - x) / (size - 1), original))
+    stats = {}
+    for bank_id, obs in seen.items():
+        n = len(obs)
+        xs, ys = [o[0] for o in obs], [o[1] for o in obs]
+        mx, my = sum(xs) / n, sum(ys) / n
+        cov = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+        var = sum((x - mx) ** 2 for x in xs) * sum((y - my) ** 2 for y in ys)
+        stats[bank_id] = {
+            'n':       n,
+            'p':       mx,
+            'rpb':     cov / sqrt(var) if var > 1e-12 else None,
+            'options': {label: sum(o[2] == label for o in obs) / n for label in LABELS},
+        }
+    return stats
+
+
+def test_streamed_stats_match_brute_force(tmp_path):
+    rng = random.Random(7)
+    keys = {
+        'quiz-a.html': make_page(rng, [1, 2, 3, 4, 5, 6]),
+        'quiz-b.html': make_page(rng, [4, 7, 8, 9]),        # bank question 4 is on both pages
+    }
+    rows = []
+    for student in range(120):
+        page = rng.choice(sorted(keys))
+        key = keys[page][0]
+        # Stronger students pick the key more often, so rpb is not just noise.
+        skill = rng.random()
+        answers = ''.join(k if rng.random() < skill else rng.choice('ABCD-') for k in key)
+        rows.append((page, answers))
+    path = tmp_path / 'submissions.csv'
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Student ID', 'Page', 'Answers'])
+        writer.writerows((f'S{i}', page, answers) for i, (page, answers) in enumerate(rows))
+
+    issues = []
+    students, items = analyse([path], keys, issues)
+    expected = brute_force(rows, keys)
+
+    assert not issues
+    assert students == len(rows)
+    assert sorted(bank_id for _, bank_id in items) == sorted(expected)
+    for (_, bank_id), totals in items.items():
+        got, want = totals.stats(), expected[bank_id]
+        assert got['key'] == 'B'
+        assert got['n'] == want['n']
+        assert got['p'] == pytest.approx(want['p'], abs=1e-4)
+        assert got['rpb'] == pytest.approx(want['rpb'], abs=1e-4)
+        for label in LABELS:
+            assert got['options'][label] == pytest.approx(want['options'][label], abs=1e-4)
@@ -0,0 +1,41 @@
+"""quiz-search.js must drop the same query words build.question_tokens leaves out of the index."""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import build
+
+NODE = shutil.which('node')
+SCRIPT = Path(__file__).resolve().parent.parent / 'quiz-search.js'
+
+
+def query_shard(shard: dict, index: dict, texts: list[str]) -> list[list[int]]:
+    script = (f'const {{QuizSearch}} = require({json.dumps(str(SCRIPT))});\n'
+              f'const shard = {json.dumps(shard)}, index = {json.dumps(index)};\n'
+              f'const hits = {json.dumps(texts)}.map(t => QuizSearch.queryShard(shard, t, index));\n'
+              f'process.stdout.write(JSON.stringify(hits));\n')
+    out = subprocess.run([NODE, '-e', script], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+INDEX = {'min_length': build.MIN_TOKEN_LENGTH, 'stopwords': sorted(build.STOPWORDS)}
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+def test_stopwords_do_not_empty_a_query():
+    texts = ['The functional unit of the kidney is the', 'A body of mass 2 kg is at rest']
+    shard = build.search_shard('Test', [{'text': t} for t in texts])
+    assert query_shard(shard, INDEX, texts) == [[1], [2]]
+
+
+@pytest.mark.skipif(NODE is None, reason='node is not installed')
+@pytest.mark.parametrize('subject', list(build.RAW_QUESTIONS))
+def test_every_title_finds_its_question(subject):
+    shard = build.search_shard(subject, list(build.RAW_QUESTIONS[subject]))
+    hits = query_shard(shard, INDEX, shard['titles'])
+    missed = [bank_id for bank_id, ids in enumerate(hits, start=1) if bank_id not in ids]
+    assert not missed
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+validate.py
+Checks question banks before anything is rendered from them.
+
+A bank is laid out as columns (one list per field) and each check is one
+pass over one column, so a bad bank reports every problem at once, each
+with the file and line it came from, instead of surfacing as a KeyError
+halfway through a shuffle. build.py runs it on every changed bank and
+generate_quiz.py on every parsed .txt file; both stop before rendering
+if anything is wrong.
+
+Usage:
+    python validate.py                       # banks/*.jsonl
+    python validate.py physics.txt           # .txt dumps, as generate_quiz.py parses them
+"""
+
+import sys
+import argparse
+from pathlib import Path
+from typing import NamedTuple, Sequence
+
+LABELS = ('A', 'B', 'C', 'D')
+FIELDS = ('id', 'text', 'options', 'answer', 'explanation', 'exception', 'topic')
+
+# Comfortably above the longest field in the current banks; anything past
+# these is almost always two questions run together or a pasted page.
+MAX_LENGTHS = {
+    'text':        1000,
+    'option':      300,
+    'explanation': 2000,
+    'exception':   2000,
+    'topic':       80,
+}
+
+
+class Issue(NamedTuple):
+    source: str
+    line:   int
+    message: str
+
+    def __str__(self) -> str:
+        return f'{self.source}:{self.line}: {self.message}'
+
+
+class ValidationError(ValueError):
+    """Raised with every issue found, so the caller can list them all."""
+
+    def __init__(self, issues: list[Issue]):
+        super().__init__(f'{len(issues)} problem(s) in the question sources')
+        self.issues = issues
+
+
+# ── Columns ───────────────────────────────────────────────────────────────────
+def columns(questions: Sequence[dict], lines: Sequence[int] | None = None) -> dict[str, Sequence]:
+    """
+    field -> one value per question (None where the field is absent), plus
+    'line': the source line of each question (row numbers from 1 without lines).
+    """
+    cols = {name: [] for name in FIELDS}
+    for q in questions:
+        for name, col in cols.items():
+            col.append(q.get(name))
+    cols['line'] = lines if lines is not None else range(1, len(questions) + 1)
+    return cols
+
+
+def _blank(value) -> bool:
+    return not isinstance(value, str) or not value.strip()
+
+
+# ── Checks (each returns (row, message) pairs) ────────────────────────────────
+def check_text(cols: dict[str, Sequence]) -> list[tuple[int, str]]:
+    return [(i, 'empty question text') for i, t in enumerate(cols['text']) if _blank(t)]
+
+
+def check_options(cols: dict[str, Sequence]) -> list[tuple[int, str]]:
+    problems = []
+    for i, opts in enumerate(cols['options']):
+        if not isinstance(opts, dict):
+            problems.append((i, 'no options'))
+            continue
+        missing = [label for label in LABELS if _blank(opts.get(label))]
+        if missing:
+            problems.append((i, f'missing option{"s" if len(missing) > 1 else ""} {", ".join(missing)}'))
+        extra = sorted(label for label in opts if label not in LABELS)
+        if extra:
+            problems.append((i, f'unexpected option{"s" if len(extra) > 1 else ""} {", ".join(extra)}'))
+        seen = {}
+        for label in LABELS:
+            value = opts.get(label)
+            if _blank(value):
+                continue
+            key = ' '.join(value.split()).casefold()
+            if key in seen:
+                problems.append((i, f'options {seen[key]} and {label} are identical'))
+            else:
+                seen[key] = label
+    return problems
+
+
+def check_answers(cols: dict[str, Sequence]) -> list[tuple[int, str]]:
+    problems = []
+    for i, (answer, opts) in enumerate(zip(cols['answer'], cols['options'])):
+        if answer not in LABELS:
+            problems.append((i, f'answer {answer!r} is not one of {"/".join(LABELS)}'))
+        elif isinstance(opts, dict) and _blank(opts.get(answer)):
+            problems.append((i, f'answer {answer} points at a missing option'))
+    return problems
+
+
+def check_ids(cols: dict[str, Sequence]) -> list[tuple[int, str]]:
+    problems = []
+    first = {}
+    for i, q_id in enumerate(cols['id']):
+        if q_id is None:
+            continue
+        if q_id in first:
+            problems.append((i, f'duplicate id {q_id} (first used on line {cols["line"][first[q_id]]})'))
+        else:
+            first[q_id] = i
+    return problems
+
+
+def check_lengths(cols: dict[str, Sequence]) -> list[tuple[int, str]]:
+    problems = []
+    for field in ('text', 'explanation', 'exception', 'topic'):
+        limit = MAX_LENGTHS[field]
+        problems.extend((i, f'{field} is {len(v)} characters (limit {limit})')
+                        for i, v in enumerate(cols[field]) if isinstance(v, str) and len(v) > limit)
+    limit = MAX_LENGTHS['option']
+    for i, opts in enumerate(cols['options']):
+        if isinstance(opts, dict):
+            problems.extend((i, f'option {label} is {len(v)} characters (limit {limit})')
+                            for label, v in opts.items() if isinstance(v, str) and len(v) > limit)
+    return problems
+
+
+CHECKS = (check_text, check_options, check_answers, check_ids, check_lengths)
+
+
+def validate_questions(questions: Sequence[dict], source: str,
+                       lines: Sequence[int] | None = None) -> list[Issue]:
+    """
+    Every problem in questions, in source order. lines[i] is the source
+    line of questions[i]; without it rows are numbered from 1.
+    """
+    cols = columns(questions, lines)
+    problems = [p for check in CHECKS for p in check(cols)]
+    problems.sort(key=lambda p: p[0])
+    return [Issue(source, cols['line'][i], message) for i, message in problems]
+
+
+def print_issues(issues: list[Issue], limit: int = 50) -> None:
+    for issue in issues[:limit]:
+        print(f'  ❌  {issue}')
+    if len(issues) > limit:
+        print(f'  ❌  … and {len(issues) - limit} more')
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Check question banks and .txt dumps for broken questions.')
+    parser.add_argument('files', nargs='*',
+                        help='.txt files to check instead of the banks (parsed as generate_quiz.py does)')
+    args = parser.parse_args()
+
+    issues = []
+    if args.files:
+        from generate_quiz import parse_txt
+        sources = [Path(f) for f in args.files]
+        for path in sources:
+            lines = []
+            issues += validate_questions(parse_txt(path, lines), path.name, lines)
+    else:
+        import build
+        sources = list(build.RAW_QUESTIONS)
+        issues = build.validate_banks(sources)
+
+    if issues:
+        print_issues(issues, limit=len(issues))
+        print(f'\n{len(issues)} problem(s) in {len({i.source for i in issues})}/{len(sources)} source(s)')
+        sys.exit(1)
+    print(f'✅  {len(sources)} source(s) OK')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+watch.py
+Dependency-free file watching for build.py --watch and generate_quiz.py --watch.
+
+Files are polled: a stat() per file per tick, and a content hash only
+when size or mtime moved, so touching a file without changing it (or an
+editor rewriting identical bytes) triggers nothing.
+"""
+
+import time
+import hashlib
+from pathlib import Path
+from typing import Callable, Iterable
+
+
+def file_digest(path: Path) -> str:
+    """sha256 of the file's bytes, read in chunks. build.py hashes banks and outputs with it too."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class Poller:
+    """Tracks a changing set of files; poll() reports which ones changed."""
+
+    def __init__(self, paths: Callable[[], Iterable[Path]]):
+        self.paths = paths
+        self.stats:   dict[Path, tuple[int, int]] = {}
+        self.digests: dict[Path, str] = {}
+
+    def poll(self) -> dict[Path, str | None]:
+        """
+        path -> new digest for every file added or changed since the last
+        poll, and path -> None for every file removed. The first poll
+        reports every file.
+        """
+        changes = {}
+        current = set()
+        for path in self.paths():
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            current.add(path)
+            sig = (st.st_size, st.st_mtime_ns)
+            if self.stats.get(path) == sig:
+                continue
+            self.stats[path] = sig
+            try:
+                digest = file_digest(path)
+            except FileNotFoundError:
+                continue
+            if self.digests.get(path) != digest:
+                self.digests[path] = digest
+                changes[path] = digest
+        for path in set(self.digests) - current:
+            del self.digests[path]
+            self.stats.pop(path, None)
+            changes[path] = None
+        return changes
+
+
+def watch(poller: Poller, on_change: Callable[[dict[Path, str | None]], None],
+          interval: float = 0.3) -> None:
+    """Poll every interval seconds and call on_change(changes) whenever something changed."""
+    try:
+        while True:
+            changes = poller.poll()
+            if changes:
+                on_change(changes)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print('\nStopped watching.')